@@ -2,26 +2,56 @@
 
 from __future__ import annotations
 
+import gc
+import importlib
+import logging
 from os import path
-from typing import Any, Dict, List, Optional, Union
-
-from enterpriseattack import (
-    campaign,
-    component,
-    data_source,
-    group,
-    mitigation,
-    software,
-    sub_technique,
-    tactic,
-    technique,
-    utils,
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
 )
 
+from enterpriseattack import identity, registry, snapshot, store, utils
+
+if TYPE_CHECKING:
+    from enterpriseattack import (
+        campaign,
+        component,
+        data_source,
+        group,
+        mitigation,
+    )
+    from enterpriseattack import software as software_mod
+    from enterpriseattack import (
+        sub_technique,
+        tactic,
+        technique,
+    )
+
 # -----------------------------------------------------------------------------
 
 __version__ = "1.0.3"
 
+# Entity class of each STIX type, as (module, class):
+_ENTITY_CLASSES = {
+    "x-mitre-tactic": ("enterpriseattack.tactic", "Tactic"),
+    "attack-pattern": ("enterpriseattack.technique", "Technique"),
+    "intrusion-set": ("enterpriseattack.group", "Group"),
+    "malware": ("enterpriseattack.software", "Software"),
+    "tool": ("enterpriseattack.software", "Software"),
+    "course-of-action": ("enterpriseattack.mitigation", "Mitigation"),
+    "x-mitre-data-source": ("enterpriseattack.data_source", "DataSource"),
+    "x-mitre-data-component": ("enterpriseattack.component", "Component"),
+    "campaign": ("enterpriseattack.campaign", "Campaign"),
+}
+_SUB_TECHNIQUE_CLASS = ("enterpriseattack.sub_technique", "SubTechnique")
+
 # -----------------------------------------------------------------------------
 # enterpriseattack Attack class:
 # -----------------------------------------------------------------------------
@@ -34,12 +64,21 @@ class Attack:
     def __init__(
         self,
         enterprise_json: Optional[Union[str, Dict[str, Any]]] = None,
-        url: str = "https://raw.githubusercontent.com/mitre/cti/master/"
-        "enterprise-attack/enterprise-attack.json",
+        url: str = utils.LATEST_URL,
         include_deprecated: bool = False,
         update: bool = False,
         mitre_version: str = "latest",
         subscriptable: bool = False,
+        use_snapshot: bool = False,
+        storage: str = "memory",
+        lazy: bool = False,
+        streaming: bool = False,
+        fields: Optional[List[str]] = None,
+        exclude_fields: Optional[List[str]] = None,
+        dedupe: bool = False,
+        shared: bool = False,
+        json_backend: Optional[str] = None,
+        entity_cache_size: Optional[int] = None,
         **kwargs: Any,
     ) -> Attack:
         """
@@ -60,10 +99,47 @@ class Attack:
                 in the loaded data. Defaults to False.
             update: Force update/re-download of data even if local cache
                 exists. Defaults to False.
-            mitre_version: Specific version of MITRE ATT&CK data to use.
+            mitre_version: Specific version of MITRE ATT&CK data to use,
+                downloaded from that version's URL unless url is given.
                 Defaults to 'latest'.
-            subscriptable: Enable subscriptable access to ATT&CK objects
-                (e.g., attack['T1055']). Defaults to False.
+            subscriptable: Return the collection properties as dicts keyed
+                by name (e.g., attack.techniques['Process Injection']).
+                Defaults to False.
+            use_snapshot: Persist the parsed data and relationship indexes
+                to a binary snapshot next to enterprise_json, and load from
+                it on later runs. The snapshot is rebuilt whenever the json
+                or the enterpriseattack version changes. Defaults to False.
+            storage: 'memory' keeps every parsed object in memory. 'mmap'
+                writes an offset-indexed object store next to
+                enterprise_json and memory-maps it, so objects are only
+                decoded when touched. Defaults to 'memory'.
+            lazy: Defer loading the dataset and indexing its relationships
+                until a property first needs them. Defaults to False.
+            streaming: Parse the local json one object at a time, building
+                the indexes in the same pass and dropping relationship
+                objects once indexed, to lower peak memory. Defaults to
+                False.
+            fields: Only keep these STIX fields of each object (eg:
+                ['name', 'x_mitre_platforms']). Fields needed for lookups
+                and relationships are always kept. Defaults to None (all).
+            exclude_fields: Drop these STIX fields from each object (eg:
+                ['description', 'x_mitre_detection']). When
+                'external_references' is dropped, the ATT&CK id and url are
+                still kept. Defaults to None.
+            dedupe: Intern keys and share repeated strings, lists and dicts
+                between objects at ingest, to reduce memory. Lists become
+                tuples and nested dicts become read-only. The estimated
+                saving is logged and kept in bytes_saved. Defaults to False.
+            shared: Share one read-only copy of the parsed dataset and its
+                indexes between every shared Attack loaded from the same
+                source, version & options in this process. The copy is
+                freed once no Attack uses it. Defaults to False.
+            json_backend: Json parser, 'orjson', 'ujson' or 'json'.
+                Defaults to None, the fastest of these installed.
+            entity_cache_size: Each STIX object's entity is created once
+                and reused while it is still referenced. This many of the
+                most recently used entities are also kept alive when
+                unreferenced. Defaults to None (only those in use).
             **kwargs: Additional keyword arguments for customization.
 
         Raises:
@@ -86,9 +162,28 @@ class Attack:
             >>> # Include deprecated objects
             >>> attack = Attack(include_deprecated=True)
 
+            >>> # Look up any object by its ATT&CK id
+            >>> technique = attack['T1055']  # Process Injection
+
             >>> # Enable subscriptable access
             >>> attack = Attack(subscriptable=True)
-            >>> technique = attack['T1055']  # Process Injection
+            >>> technique = attack.techniques['Process Injection']
+
+            >>> # Skip parsing on warm starts
+            >>> attack = Attack(use_snapshot=True)
+
+            >>> # Decode objects on demand from a memory-mapped store
+            >>> attack = Attack(storage='mmap')
+
+            >>> # Start instantly, load on first use
+            >>> attack = Attack(lazy=True)
+            >>> tactics = attack.tactics  # Loads & indexes
+
+            >>> # Load once, however many modules create an Attack
+            >>> attack = Attack(shared=True)
+
+            >>> # Load in the parent of pre-fork workers
+            >>> attack = Attack().preload()
         """
         # Set subscriptable bool, this allows for .get(str) against properies:
         self.subscriptable = subscriptable
@@ -96,12 +191,8 @@ class Attack:
         # Change url to specific Mitre ATT&CK version if user supplied
         # Remove 'v' if user supplied in version:
         self.mitre_version = mitre_version
-        if mitre_version != "latest":
-            url = (
-                "https://raw.githubusercontent.com/mitre/cti/ATT%26CK-v"
-                f'{mitre_version.replace("v", "")}/enterprise-attack/'
-                "enterprise-attack.json"
-            )
+        if mitre_version != "latest" and url == utils.LATEST_URL:
+            url = utils.version_url(mitre_version)
 
         # Save the json dump to the same directory the script lives if
         # none supplied:
@@ -110,22 +201,620 @@ class Attack:
                 f"{path.dirname(path.realpath(__file__))}"
                 "/enterprise-attack.json"
             )
-            self.enterprise_json = enterprise_json
 
-        # Parse the json:
-        self.attack_objects = utils.read_json(
-            url, enterprise_json, update, **kwargs
-        )
+        self.enterprise_json = enterprise_json
 
         # Allow for including depreciated items Mitre has revoked:
         self.include_deprecated = include_deprecated
 
-        # Set the relationships of all objects, and create a dict
-        # sorted by ID's:
-        self.relationships, self.id_lookup = utils.set_relationships(
-            self.attack_objects
+        if storage not in ("memory", "mmap"):
+            raise Error(f"Unknown storage: {storage}")
+
+        self.storage = storage
+        self.lazy = lazy
+        self.streaming = streaming
+
+        # Drop unwanted fields from every object at ingest:
+        self.fields = fields
+        self.exclude_fields = exclude_fields
+        self._project = utils.make_projection(fields, exclude_fields)
+
+        # Check the json parser is available before loading:
+        self.json_backend = json_backend
+        utils.json_loads(json_backend)
+
+        # Share repeated values between objects at ingest:
+        self.dedupe = dedupe
+        self.bytes_saved = None
+
+        # Create each entity once, see identity_map:
+        self.entity_cache_size = entity_cache_size
+        self._identity_map = None
+
+        self._variant = {}
+        if self._project:
+            self._variant["fields"] = (
+                None if fields is None else sorted(fields)
+            )
+            self._variant["exclude_fields"] = sorted(exclude_fields or [])
+        if dedupe:
+            self._variant["dedupe"] = True
+        # Streaming drops the relationship objects from the dataset:
+        if streaming:
+            self._variant["streaming"] = True
+        self._variant = self._variant or None
+
+        # Remember how to load the dataset, for when it is first needed:
+        self._url = url
+        self._update = update
+        self._use_snapshot = use_snapshot
+        self._kwargs = kwargs
+        self._progress = None
+        self._loaded = False
+        self._indexed = False
+
+        # Share the dataset with other Attacks loading the same one:
+        self.shared = shared
+        self._dataset = None
+        self._dataset_key = (
+            (
+                path.realpath(enterprise_json)
+                if isinstance(enterprise_json, str)
+                else id(enterprise_json)
+            ),
+            url,
+            mitre_version,
+            storage,
+            repr(self._variant),
         )
 
+        if lazy:
+            self.attack_objects = utils.LazyMapping(self._load)
+            self.relationships = utils.LazyMapping(lambda: self._index()[0])
+            self.id_lookup = utils.LazyMapping(lambda: self._index()[1])
+        else:
+            self._index()
+
+    # -------------------------------------------------------------------------
+
+    def _load(self) -> Dict[str, Any]:
+        """
+        Load the dataset, once, from the cheapest valid source.
+
+        A snapshot or object store also provides the indexes, otherwise
+        they are built by _index().
+
+        Returns:
+            The parsed dataset (attack_objects).
+        """
+        if self._loaded:
+            return self.attack_objects
+
+        if self.shared:
+            return self._load_shared()
+
+        return self._load_dataset()
+
+    def _load_dataset(self) -> Dict[str, Any]:
+        """Load the dataset, applying the ingest transforms"""
+        deduplicator = utils.Deduplicator() if self.dedupe else None
+        transform = utils.chain_transforms(self._project, deduplicator)
+
+        with utils.log_duration("Loading dataset", self._progress):
+            self._read_dataset(transform)
+
+        if deduplicator and deduplicator.bytes_saved:
+            self.bytes_saved = deduplicator.bytes_saved
+            logging.info(
+                f"Deduplicated dataset values, saving ~{self.bytes_saved} "
+                "bytes"
+            )
+
+        self._loaded = True
+        return self.attack_objects
+
+    def _load_shared(self) -> Dict[str, Any]:
+        """
+        Adopt the dataset registered by another shared Attack, or load,
+        index & register it. Updating always loads & registers a new one.
+
+        Returns:
+            The read-only parsed dataset (attack_objects).
+        """
+        with registry.lock(self._dataset_key):
+            dataset = None
+            if not self._update:
+                dataset = registry.get_dataset(self._dataset_key)
+
+            if dataset is None:
+                self._load_dataset()
+                self._index()
+                dataset = registry.register_dataset(
+                    self._dataset_key,
+                    registry.Dataset(
+                        self.attack_objects,
+                        self.relationships,
+                        self.id_lookup,
+                    ),
+                )
+            else:
+                logging.debug("Reusing shared dataset")
+
+        # Holding the dataset keeps it registered:
+        self._dataset = dataset
+        self.attack_objects = dataset.attack_objects
+        self.relationships = dataset.relationships
+        self.id_lookup = dataset.id_lookup
+        self._loaded = True
+        self._indexed = True
+        return self.attack_objects
+
+    # -------------------------------------------------------------------------
+
+    def _index(self) -> Tuple[Dict[str, List[str]], Dict[str, Dict]]:
+        """
+        Index the relationships and ids of the dataset, once.
+
+        Returns:
+            Tuple of (relationships dict, id_lookup dict).
+        """
+        if self._indexed:
+            return self.relationships, self.id_lookup
+
+        attack_objects = self._load()
+
+        if not self._indexed:
+            # Set the relationships of all objects, and create a dict
+            # sorted by ID's:
+            with utils.log_duration("Indexing relationships", self._progress):
+                self.relationships, self.id_lookup = utils.set_relationships(
+                    attack_objects
+                )
+            self._indexed = True
+
+            if self._use_snapshot:
+                snapshot.write_snapshot(
+                    self.enterprise_json,
+                    self.attack_objects,
+                    self.relationships,
+                    self.id_lookup,
+                    self._variant,
+                )
+
+        return self.relationships, self.id_lookup
+
+    # -------------------------------------------------------------------------
+
+    def _read_dataset(
+        self, transform: Optional[Callable[[Dict], Dict]]
+    ) -> None:
+        """
+        Read the dataset, and its indexes when they were persisted.
+
+        Args:
+            transform: Ingest transform to apply to freshly parsed objects.
+        """
+
+        # Refresh the json, this is None when the local copy is current:
+        attack_objects = None
+        if self._update:
+            with utils.log_duration("Downloading dataset", self._progress):
+                attack_objects = utils.download(
+                    self._url,
+                    self.enterprise_json,
+                    self.json_backend,
+                    **self._kwargs,
+                )
+            if attack_objects is not None:
+                utils.transform_objects(attack_objects, transform)
+
+        if self.storage == "mmap":
+            object_store = None
+            if attack_objects is None:
+                object_store = store.open_store(
+                    self.enterprise_json, self._variant
+                )
+
+            if object_store is None:
+                if attack_objects is None:
+                    attack_objects = self._read_json(transform)
+                relationships, id_lookup = utils.set_relationships(
+                    attack_objects
+                )
+
+                if store.write_store(
+                    self.enterprise_json,
+                    attack_objects,
+                    relationships,
+                    self._variant,
+                    links=id_lookup.links,
+                ):
+                    attack_objects = relationships = id_lookup = None
+                    object_store = store.open_store(
+                        self.enterprise_json, self._variant
+                    )
+
+            if object_store is not None:
+                self.attack_objects = {"objects": object_store.objects}
+                self.relationships = object_store.relationships
+                self.id_lookup = object_store
+                self._indexed = True
+                return
+
+            logging.warning(
+                "Unable to use the object store, keeping objects in memory"
+            )
+
+        # Load the parsed json & indexes from a snapshot if still valid:
+        cached = None
+        if self._use_snapshot and attack_objects is None:
+            cached = snapshot.read_snapshot(
+                self.enterprise_json, self._variant
+            )
+
+        if cached:
+            self.attack_objects = cached["attack_objects"]
+            self.relationships = cached["relationships"]
+            self.id_lookup = cached["id_lookup"]
+            self._indexed = True
+            return
+
+        # Parse & index the json in one pass, unless it needs downloading:
+        if (
+            attack_objects is None
+            and self.streaming
+            and path.isfile(self.enterprise_json)
+        ):
+            self.attack_objects, self.relationships, self.id_lookup = (
+                utils.stream_json(self.enterprise_json, transform=transform)
+            )
+            self._indexed = True
+
+            if self._use_snapshot:
+                snapshot.write_snapshot(
+                    self.enterprise_json,
+                    self.attack_objects,
+                    self.relationships,
+                    self.id_lookup,
+                    self._variant,
+                )
+            return
+
+        # Parse the json:
+        if attack_objects is None:
+            attack_objects = self._read_json(transform)
+        self.attack_objects = attack_objects
+
+    # -------------------------------------------------------------------------
+
+    def _read_json(
+        self, transform: Optional[Callable[[Dict], Dict]]
+    ) -> Dict[str, Any]:
+        """Parse the local json (downloading it if missing) & transform it"""
+        attack_objects = utils.read_json(
+            self._url,
+            self.enterprise_json,
+            False,
+            self.json_backend,
+            **self._kwargs,
+        )
+        return utils.transform_objects(attack_objects, transform)
+
+    # -------------------------------------------------------------------------
+
+    def preload(self) -> Attack:
+        """
+        Load & index everything now, then freeze it for pre-fork servers.
+
+        Call this in the parent process (eg: gunicorn preload_app) before
+        workers fork. The dataset and indexes are made immutable, and every
+        object tracked by the garbage collector is moved to its permanent
+        generation with gc.freeze(), so collections in the workers no
+        longer write to the pages shared copy-on-write with the parent.
+
+        Returns:
+            The Attack object, so it can be chained onto its creation.
+
+        Example:
+            >>> attack = Attack().preload()
+        """
+        self._index()
+
+        # An object store is already shared through the page cache:
+        if not isinstance(self.id_lookup, store.ObjectStore):
+            memo = {}
+            self.attack_objects = utils.freeze(self.attack_objects, memo)
+            self.relationships = utils.freeze(self.relationships, memo)
+            self.id_lookup = utils.freeze(self.id_lookup, memo)
+
+            if self._dataset is not None:
+                self._dataset.attack_objects = self.attack_objects
+                self._dataset.relationships = self.relationships
+                self._dataset.id_lookup = self.id_lookup
+
+        gc.collect()
+        gc.freeze()
+        logging.debug(f"Froze {gc.get_freeze_count()} objects for forking")
+
+        return self
+
+    # -------------------------------------------------------------------------
+
+    @property
+    def identity_map(self) -> identity.IdentityMap:
+        """The identity map creating each entity of the dataset once.
+
+        A new one is started whenever the dataset is replaced, so entities
+        of an older dataset are never returned.
+
+        Returns:
+            The IdentityMap of the current dataset.
+        """
+        identity_map = self._identity_map
+
+        if (
+            identity_map is None
+            or identity_map.attack_objects is not self.attack_objects
+            or identity_map.relationships is not self.relationships
+            or identity_map.id_lookup is not self.id_lookup
+        ):
+            identity_map = self._identity_map = identity.IdentityMap(
+                self.attack_objects,
+                self.relationships,
+                self.id_lookup,
+                self.entity_cache_size,
+            )
+
+        return identity_map
+
+    def clear_caches(self) -> None:
+        """Forget the entities created so far & their memoised relations.
+
+        Entities memoise their relations (technique.groups etc) on first
+        access. This is called whenever the dataset is updated in place,
+        and can be called to free the memory they use.
+        """
+        if self._identity_map is not None:
+            self._identity_map.clear()
+
+    # -------------------------------------------------------------------------
+
+    def delta_update(self, url: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Download the dataset again, and only apply the objects that changed.
+
+        The new dataset is compared with the loaded one by STIX id and
+        modified time. Only the added and modified objects are taken from
+        it, unchanged objects are kept. Then attack_objects, id_lookup and
+        relationships are updated in place, in the new dataset's order.
+        When the dataset was not modified since the local copy was
+        downloaded, that copy is compared instead, as another process may
+        have updated it since this one was loaded.
+
+        Args:
+            url: URL of the new dataset, eg: of the next ATT&CK release.
+                Defaults to the url the Attack was created with.
+
+        Returns:
+            Dict of the 'added', 'removed' and 'modified' STIX ids, all
+            empty if the loaded dataset is already up to date.
+
+        Raises:
+            Error: If the dataset is read-only (storage='mmap', shared or
+                preloaded), or its relationship objects were dropped by
+                streaming=True.
+
+        Example:
+            >>> attack = Attack(mitre_version='v14')
+            >>> changes = attack.delta_update(
+            ...     url=utils.version_url('v15')
+            ... )
+        """
+        self._index()
+
+        objects = self.attack_objects.get("objects")
+        if (
+            self.streaming
+            or not isinstance(self.attack_objects, dict)
+            or not isinstance(objects, list)
+            or not isinstance(self.id_lookup, utils.ObjectIndex)
+            or self.id_lookup.read_only
+        ):
+            raise Error(
+                "Delta updates need a writable in-memory dataset, loaded "
+                "without streaming"
+            )
+
+        summary = {"added": [], "removed": [], "modified": []}
+
+        url = url or self._url
+        with utils.log_duration("Downloading dataset", self._progress):
+            new_attack_objects = utils.download(
+                url, self.enterprise_json, self.json_backend, **self._kwargs
+            )
+
+        # Not modified since the last download, which may have been made by
+        # another Attack or process after this one loaded, so the local copy
+        # is diffed instead:
+        if new_attack_objects is None:
+            new_attack_objects = utils.read_json(
+                url,
+                self.enterprise_json,
+                False,
+                self.json_backend,
+                **self._kwargs,
+            )
+
+        if not new_attack_objects.get("objects"):
+            raise Error(
+                "Unable to find enterprise objects, json seems invalid."
+            )
+
+        with utils.log_duration("Applying changed objects", self._progress):
+            new_objects = new_attack_objects["objects"]
+            added, removed, modified = utils.diff_objects(objects, new_objects)
+
+            changed = {id(obj): obj for obj in added}
+            changed.update((id(new), new) for _, new in modified)
+
+            deduplicator = utils.Deduplicator() if self.dedupe else None
+            transform = utils.chain_transforms(self._project, deduplicator)
+            if transform:
+                changed = {key: transform(obj) for key, obj in changed.items()}
+                added = [changed[id(obj)] for obj in added]
+                modified = [(old, changed[id(new)]) for old, new in modified]
+
+            # Unchanged objects are kept, in the new dataset's order, & the
+            # indexes rebuilt in place so their order matches a fresh load:
+            if added or removed or modified:
+                unchanged = {obj.get("id"): obj for obj in objects}
+                objects[:] = [
+                    changed.get(id(obj)) or unchanged[obj.get("id")]
+                    for obj in new_objects
+                ]
+
+                self.relationships.clear()
+                self.id_lookup.clear()
+                for obj in objects:
+                    utils.index_object(obj, self.relationships, self.id_lookup)
+
+        # Entities of changed objects are recreated on next use:
+        self.clear_caches()
+
+        summary["added"] = [obj.get("id") for obj in added]
+        summary["removed"] = [obj.get("id") for obj in removed]
+        summary["modified"] = [new.get("id") for _, new in modified]
+        logging.info(
+            f"Applied {len(added)} added, {len(removed)} removed & "
+            f"{len(modified)} modified objects"
+        )
+
+        self._url = url
+        if self._use_snapshot:
+            snapshot.write_snapshot(
+                self.enterprise_json,
+                self.attack_objects,
+                self.relationships,
+                self.id_lookup,
+                self._variant,
+            )
+
+        return summary
+
+    # -------------------------------------------------------------------------
+
+    def __getitem__(self, attack_id: str) -> Any:
+        """Get an ATT&CK object by its ATT&CK id or STIX id.
+
+        The ids are indexed when the dataset is, so this does not scan or
+        build any other object.
+
+        Args:
+            attack_id: ATT&CK id (e.g., 'T1055', 'G0102', 'S0154') or STIX
+                id (e.g., 'attack-pattern--43e7dc91-...').
+
+        Returns:
+            The Tactic, Technique, SubTechnique, Group, Software,
+            Mitigation, DataSource, Component or Campaign.
+
+        Raises:
+            KeyError: If there is no such object, or it is deprecated and
+                include_deprecated is False.
+
+        Example:
+            >>> attack['T1055'].name
+            'Process Injection'
+        """
+        if "--" in attack_id:
+            attack_obj = self.id_lookup.get(attack_id)
+        else:
+            attack_obj = self.id_lookup.external_id(attack_id)
+
+        if attack_obj is None or attack_obj.get("type") not in _ENTITY_CLASSES:
+            raise KeyError(attack_id)
+        if not self.include_deprecated and attack_obj.get(
+            "x_mitre_deprecated"
+        ):
+            raise KeyError(attack_id)
+
+        if attack_obj.get("x_mitre_is_subtechnique"):
+            module_name, class_name = _SUB_TECHNIQUE_CLASS
+        else:
+            module_name, class_name = _ENTITY_CLASSES[attack_obj["type"]]
+
+        entity_class = getattr(
+            importlib.import_module(module_name), class_name
+        )
+        return self.identity_map.get(entity_class, attack_obj)
+
+    def get(self, attack_id: str, default: Any = None) -> Any:
+        """Get an ATT&CK object by its ATT&CK id or STIX id, or default.
+
+        Args:
+            attack_id: ATT&CK id (e.g., 'T1055') or STIX id.
+            default: Returned when there is no such object.
+
+        Returns:
+            The object as in attack[attack_id], otherwise default.
+        """
+        try:
+            return self[attack_id]
+        except KeyError:
+            return default
+
+    def get_by_id(self, attack_id: str) -> Any:
+        """Get an ATT&CK object by its ATT&CK id or STIX id.
+
+        Args:
+            attack_id: ATT&CK id (e.g., 'T1055') or STIX id.
+
+        Returns:
+            The object as in attack[attack_id], otherwise None.
+        """
+        return self.get(attack_id)
+
+    def detection_map(self) -> Dict[str, Dict[str, List[str]]]:
+        """Map every data source to its components & what they detect.
+
+        Built in one pass over the data sources, following the indexed
+        data source -> component -> technique links, without creating any
+        entity objects.
+
+        Returns:
+            Dict of data source name to a dict of its component names to
+            the ATT&CK ids of the techniques & sub-techniques each detects.
+
+        Example:
+            >>> attack.detection_map()["Process"]["OS API Execution"]
+            ['T1055', 'T1055.001', ...]
+        """
+
+        def included(attack_obj: Dict[str, Any]) -> bool:
+            return self.include_deprecated or not attack_obj.get(
+                "x_mitre_deprecated"
+            )
+
+        detection_map = {}
+        for source_obj in self.id_lookup.of_type("x-mitre-data-source"):
+            if not included(source_obj):
+                continue
+
+            components = detection_map[source_obj.get("name")] = {}
+            for component_obj, attack_objs in utils.detection_chain(
+                self.id_lookup, source_obj["id"]
+            ):
+                if included(component_obj):
+                    components[component_obj.get("name")] = [
+                        utils.expand_external(
+                            attack_obj.get("external_references"),
+                            "external_id",
+                        )
+                        for attack_obj in attack_objs
+                        if included(attack_obj)
+                    ]
+
+        return detection_map
+
     # -------------------------------------------------------------------------
 
     @property
@@ -136,48 +825,33 @@ class Attack:
             List of Tactic objects if subscriptable=False, otherwise a
             dictionary mapping tactic names to Tactic objects.
         """
+        from . import tactic
+
         if self.subscriptable:
             tactics_ = {}
         else:
             tactics_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "x-mitre-tactic":
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            tactics_.append(
-                                tactic.Tactic(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            tactics_[attack_obj.get("name")] = tactic.Tactic(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type("x-mitre-tactic"):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         tactics_.append(
-                            tactic.Tactic(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
-                            )
+                            self.identity_map.get(tactic.Tactic, attack_obj)
                         )
                     else:
-                        tactics_[attack_obj.get("name")] = tactic.Tactic(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
+                        tactics_[attack_obj.get("name")] = (
+                            self.identity_map.get(tactic.Tactic, attack_obj)
                         )
+            else:
+                if not self.subscriptable:
+                    tactics_.append(
+                        self.identity_map.get(tactic.Tactic, attack_obj)
+                    )
+                else:
+                    tactics_[attack_obj.get("name")] = self.identity_map.get(
+                        tactic.Tactic, attack_obj
+                    )
 
         return tactics_
 
@@ -195,55 +869,44 @@ class Attack:
             dictionary mapping technique names to Technique objects.
             Excludes sub-techniques.
         """
+        from . import technique
+
         if self.subscriptable:
             techniques_ = {}
         else:
             techniques_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "attack-pattern":
-                if not attack_obj.get("x_mitre_is_subtechnique"):
-                    if not self.include_deprecated:
-                        if not attack_obj.get("x_mitre_deprecated"):
-                            if not self.subscriptable:
-                                techniques_.append(
-                                    technique.Technique(
-                                        self.attack_objects,
-                                        self.relationships,
-                                        self.id_lookup,
-                                        **attack_obj,
-                                    )
-                                )
-                            else:
-                                techniques_[attack_obj.get("name")] = (
-                                    technique.Technique(
-                                        self.attack_objects,
-                                        self.relationships,
-                                        self.id_lookup,
-                                        **attack_obj,
-                                    )
-                                )
-
-                    else:
+        for attack_obj in self.id_lookup.of_type("attack-pattern"):
+            if not attack_obj.get("x_mitre_is_subtechnique"):
+                if not self.include_deprecated:
+                    if not attack_obj.get("x_mitre_deprecated"):
                         if not self.subscriptable:
                             techniques_.append(
-                                technique.Technique(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
+                                self.identity_map.get(
+                                    technique.Technique, attack_obj
                                 )
                             )
                         else:
                             techniques_[attack_obj.get("name")] = (
-                                technique.Technique(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
+                                self.identity_map.get(
+                                    technique.Technique, attack_obj
                                 )
                             )
 
+                else:
+                    if not self.subscriptable:
+                        techniques_.append(
+                            self.identity_map.get(
+                                technique.Technique, attack_obj
+                            )
+                        )
+                    else:
+                        techniques_[attack_obj.get("name")] = (
+                            self.identity_map.get(
+                                technique.Technique, attack_obj
+                            )
+                        )
+
         return techniques_
 
     # -------------------------------------------------------------------------
@@ -262,53 +925,42 @@ class Attack:
             dictionary mapping sub-technique names to SubTechnique objects.
             Only includes attack patterns that are sub-techniques.
         """
+        from . import sub_technique
+
         if self.subscriptable:
             sub_techniques_ = {}
         else:
             sub_techniques_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "attack-pattern":
-                if attack_obj.get("x_mitre_is_subtechnique"):
-                    if not self.include_deprecated:
-                        if not attack_obj.get("x_mitre_deprecated"):
-                            if not self.subscriptable:
-                                sub_techniques_.append(
-                                    sub_technique.SubTechnique(
-                                        self.attack_objects,
-                                        self.relationships,
-                                        self.id_lookup,
-                                        **attack_obj,
-                                    )
-                                )
-                            else:
-                                sub_techniques_[attack_obj.get("name")] = (
-                                    sub_technique.SubTechnique(
-                                        self.attack_objects,
-                                        self.relationships,
-                                        self.id_lookup,
-                                        **attack_obj,
-                                    )
-                                )
-                    else:
+        for attack_obj in self.id_lookup.of_type("attack-pattern"):
+            if attack_obj.get("x_mitre_is_subtechnique"):
+                if not self.include_deprecated:
+                    if not attack_obj.get("x_mitre_deprecated"):
                         if not self.subscriptable:
                             sub_techniques_.append(
-                                sub_technique.SubTechnique(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
+                                self.identity_map.get(
+                                    sub_technique.SubTechnique, attack_obj
                                 )
                             )
                         else:
                             sub_techniques_[attack_obj.get("name")] = (
-                                sub_technique.SubTechnique(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
+                                self.identity_map.get(
+                                    sub_technique.SubTechnique, attack_obj
                                 )
                             )
+                else:
+                    if not self.subscriptable:
+                        sub_techniques_.append(
+                            self.identity_map.get(
+                                sub_technique.SubTechnique, attack_obj
+                            )
+                        )
+                    else:
+                        sub_techniques_[attack_obj.get("name")] = (
+                            self.identity_map.get(
+                                sub_technique.SubTechnique, attack_obj
+                            )
+                        )
 
         return sub_techniques_
 
@@ -324,48 +976,33 @@ class Attack:
             dictionary mapping group names to Group objects.
             Groups represent threat actor organizations and intrusion sets.
         """
+        from . import group
+
         if self.subscriptable:
             groups_ = {}
         else:
             groups_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "intrusion-set":
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            groups_.append(
-                                group.Group(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            groups_[attack_obj.get("name")] = group.Group(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type("intrusion-set"):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         groups_.append(
-                            group.Group(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
-                            )
+                            self.identity_map.get(group.Group, attack_obj)
                         )
                     else:
-                        groups_[attack_obj.get("name")] = group.Group(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
+                        groups_[attack_obj.get("name")] = (
+                            self.identity_map.get(group.Group, attack_obj)
                         )
+            else:
+                if not self.subscriptable:
+                    groups_.append(
+                        self.identity_map.get(group.Group, attack_obj)
+                    )
+                else:
+                    groups_[attack_obj.get("name")] = self.identity_map.get(
+                        group.Group, attack_obj
+                    )
 
         return groups_
 
@@ -374,7 +1011,7 @@ class Attack:
     @property
     def software(
         self,
-    ) -> Union[List[software.Software], Dict[str, software.Software]]:
+    ) -> Union[List[software_mod.Software], Dict[str, software_mod.Software]]:
         """
         Get all software from the ATT&CK framework.
 
@@ -383,50 +1020,39 @@ class Attack:
             dictionary mapping software names to Software objects.
             Includes both tools and malware.
         """
+        from . import software as software_mod
+
         if self.subscriptable:
             software_ = {}
         else:
             software_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") in ["tool", "malware"]:
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            software_.append(
-                                software.Software(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            software_[attack_obj.get("name")] = (
-                                software.Software(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type(utils.SOFTWARE):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         software_.append(
-                            software.Software(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                software_mod.Software, attack_obj
                             )
                         )
                     else:
-                        software_[attack_obj.get("name")] = software.Software(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
+                        software_[attack_obj.get("name")] = (
+                            self.identity_map.get(
+                                software_mod.Software, attack_obj
+                            )
                         )
+            else:
+                if not self.subscriptable:
+                    software_.append(
+                        self.identity_map.get(
+                            software_mod.Software, attack_obj
+                        )
+                    )
+                else:
+                    software_[attack_obj.get("name")] = self.identity_map.get(
+                        software_mod.Software, attack_obj
+                    )
 
         return software_
 
@@ -435,7 +1061,7 @@ class Attack:
     @property
     def malware(
         self,
-    ) -> Union[List[software.Software], Dict[str, software.Software]]:
+    ) -> Union[List[software_mod.Software], Dict[str, software_mod.Software]]:
         """
         Get all malware from the ATT&CK framework.
 
@@ -444,50 +1070,39 @@ class Attack:
             dictionary mapping malware names to Software objects.
             Only includes objects with type 'malware'.
         """
+        from . import software as software_mod
+
         if self.subscriptable:
             malware_ = {}
         else:
             malware_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "malware":
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            malware_.append(
-                                software.Software(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            malware_[attack_obj.get("name")] = (
-                                software.Software(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type("malware"):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         malware_.append(
-                            software.Software(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                software_mod.Software, attack_obj
                             )
                         )
                     else:
-                        malware_[attack_obj.get("name")] = software.Software(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
+                        malware_[attack_obj.get("name")] = (
+                            self.identity_map.get(
+                                software_mod.Software, attack_obj
+                            )
+                        )
+            else:
+                if not self.subscriptable:
+                    malware_.append(
+                        self.identity_map.get(
+                            software_mod.Software, attack_obj
                         )
+                    )
+                else:
+                    malware_[attack_obj.get("name")] = self.identity_map.get(
+                        software_mod.Software, attack_obj
+                    )
 
         return malware_
 
@@ -496,7 +1111,7 @@ class Attack:
     @property
     def tools(
         self,
-    ) -> Union[List[software.Software], Dict[str, software.Software]]:
+    ) -> Union[List[software_mod.Software], Dict[str, software_mod.Software]]:
         """
         Get all tools from the ATT&CK framework.
 
@@ -505,48 +1120,37 @@ class Attack:
             dictionary mapping tool names to Software objects.
             Only includes objects with type 'tool'.
         """
+        from . import software as software_mod
+
         if self.subscriptable:
             tools_ = {}
         else:
             tools_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "tool":
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            tools_.append(
-                                software.Software(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            tools_[attack_obj.get("name")] = software.Software(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type("tool"):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         tools_.append(
-                            software.Software(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                software_mod.Software, attack_obj
                             )
                         )
                     else:
-                        tools_[attack_obj.get("name")] = software.Software(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
+                        tools_[attack_obj.get("name")] = self.identity_map.get(
+                            software_mod.Software, attack_obj
+                        )
+            else:
+                if not self.subscriptable:
+                    tools_.append(
+                        self.identity_map.get(
+                            software_mod.Software, attack_obj
                         )
+                    )
+                else:
+                    tools_[attack_obj.get("name")] = self.identity_map.get(
+                        software_mod.Software, attack_obj
+                    )
 
         return tools_
 
@@ -564,52 +1168,41 @@ class Attack:
             dictionary mapping mitigation names to Mitigation objects.
             Includes all course-of-action objects.
         """
+        from . import mitigation
+
         if self.subscriptable:
             mitigations_ = {}
         else:
             mitigations_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "course-of-action":
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            mitigations_.append(
-                                mitigation.Mitigation(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            mitigations_[attack_obj.get("name")] = (
-                                mitigation.Mitigation(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type("course-of-action"):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         mitigations_.append(
-                            mitigation.Mitigation(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                mitigation.Mitigation, attack_obj
                             )
                         )
                     else:
                         mitigations_[attack_obj.get("name")] = (
-                            mitigation.Mitigation(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                mitigation.Mitigation, attack_obj
                             )
                         )
+            else:
+                if not self.subscriptable:
+                    mitigations_.append(
+                        self.identity_map.get(
+                            mitigation.Mitigation, attack_obj
+                        )
+                    )
+                else:
+                    mitigations_[attack_obj.get("name")] = (
+                        self.identity_map.get(
+                            mitigation.Mitigation, attack_obj
+                        )
+                    )
 
         return mitigations_
 
@@ -628,52 +1221,41 @@ class Attack:
             dictionary mapping data source names to DataSource objects.
             Includes all x-mitre-data-source objects.
         """
+        from . import data_source
+
         if self.subscriptable:
             data_sources_ = {}
         else:
             data_sources_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "x-mitre-data-source":
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            data_sources_.append(
-                                data_source.DataSource(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            data_sources_[attack_obj.get("name")] = (
-                                data_source.DataSource(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type("x-mitre-data-source"):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         data_sources_.append(
-                            data_source.DataSource(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                data_source.DataSource, attack_obj
                             )
                         )
                     else:
                         data_sources_[attack_obj.get("name")] = (
-                            data_source.DataSource(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                data_source.DataSource, attack_obj
                             )
                         )
+            else:
+                if not self.subscriptable:
+                    data_sources_.append(
+                        self.identity_map.get(
+                            data_source.DataSource, attack_obj
+                        )
+                    )
+                else:
+                    data_sources_[attack_obj.get("name")] = (
+                        self.identity_map.get(
+                            data_source.DataSource, attack_obj
+                        )
+                    )
 
         return data_sources_
 
@@ -691,52 +1273,37 @@ class Attack:
             dictionary mapping data source names to Components objects.
             Includes all x-mitre-component objects.
         """
+        from . import component
+
         if self.subscriptable:
             components_ = {}
         else:
             components_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "x-mitre-data-component":
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            components_.append(
-                                component.Component(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            components_[attack_obj.get("name")] = (
-                                component.Component(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type("x-mitre-data-component"):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         components_.append(
-                            component.Component(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                component.Component, attack_obj
                             )
                         )
                     else:
                         components_[attack_obj.get("name")] = (
-                            component.Component(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                component.Component, attack_obj
                             )
                         )
+            else:
+                if not self.subscriptable:
+                    components_.append(
+                        self.identity_map.get(component.Component, attack_obj)
+                    )
+                else:
+                    components_[attack_obj.get("name")] = (
+                        self.identity_map.get(component.Component, attack_obj)
+                    )
 
         return components_
 
@@ -754,50 +1321,37 @@ class Attack:
             dictionary mapping data source names to Campaign objects.
             Includes all campaign objects.
         """
+        from . import campaign
+
         if self.subscriptable:
             campaigns_ = {}
         else:
             campaigns_ = []
 
-        for attack_obj in self.attack_objects.get("objects"):
-            if attack_obj.get("type") == "campaign":
-                if not self.include_deprecated:
-                    if not attack_obj.get("x_mitre_deprecated"):
-                        if not self.subscriptable:
-                            campaigns_.append(
-                                campaign.Campaign(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                        else:
-                            campaigns_[attack_obj.get("name")] = (
-                                campaign.Campaign(
-                                    self.attack_objects,
-                                    self.relationships,
-                                    self.id_lookup,
-                                    **attack_obj,
-                                )
-                            )
-                else:
+        for attack_obj in self.id_lookup.of_type("campaign"):
+            if not self.include_deprecated:
+                if not attack_obj.get("x_mitre_deprecated"):
                     if not self.subscriptable:
                         campaigns_.append(
-                            campaign.Campaign(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
+                            self.identity_map.get(
+                                campaign.Campaign, attack_obj
                             )
                         )
                     else:
-                        campaigns_[attack_obj.get("name")] = campaign.Campaign(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
+                        campaigns_[attack_obj.get("name")] = (
+                            self.identity_map.get(
+                                campaign.Campaign, attack_obj
+                            )
                         )
+            else:
+                if not self.subscriptable:
+                    campaigns_.append(
+                        self.identity_map.get(campaign.Campaign, attack_obj)
+                    )
+                else:
+                    campaigns_[attack_obj.get("name")] = self.identity_map.get(
+                        campaign.Campaign, attack_obj
+                    )
 
         return campaigns_
 
@@ -826,3 +1380,36 @@ class Error(Exception):
             The error message as a string.
         """
         return self.message
+
+
+# -----------------------------------------------------------------------------
+# Imported on first use, to keep `import enterpriseattack` fast:
+# -----------------------------------------------------------------------------
+
+_LAZY_ATTRIBUTES = {
+    "campaign": ("enterpriseattack.campaign", None),
+    "component": ("enterpriseattack.component", None),
+    "data_source": ("enterpriseattack.data_source", None),
+    "group": ("enterpriseattack.group", None),
+    "mitigation": ("enterpriseattack.mitigation", None),
+    "software": ("enterpriseattack.software", None),
+    "sub_technique": ("enterpriseattack.sub_technique", None),
+    "tactic": ("enterpriseattack.tactic", None),
+    "technique": ("enterpriseattack.technique", None),
+    "AsyncAttack": ("enterpriseattack.async_attack", "AsyncAttack"),
+    "load_versions": ("enterpriseattack.bulk", "load_versions"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the entity modules, AsyncAttack & load_versions when used"""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name)
+    if attribute:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+    return value
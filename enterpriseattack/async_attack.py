@@ -0,0 +1,109 @@
+# -----------------------------------------------------------------------------
+
+import asyncio
+import copy
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional
+
+import enterpriseattack
+
+# -----------------------------------------------------------------------------
+
+Progress = Callable[[str, Optional[float]], Any]
+
+# -----------------------------------------------------------------------------
+# AsyncAttack class:
+# -----------------------------------------------------------------------------
+
+
+class AsyncAttack(enterpriseattack.Attack):
+
+    # -------------------------------------------------------------------------
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        An Attack that is loaded & refreshed without blocking the event loop.
+
+        Create it with `await AsyncAttack.load(...)`, which takes the same
+        arguments as Attack. Downloading, parsing and indexing run in an
+        executor, and the dataset is only swapped in once it is ready.
+        """
+        kwargs.setdefault('lazy', True)
+        super().__init__(*args, **kwargs)
+        self._executor = None
+
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    async def load(
+        cls,
+        *args: Any,
+        progress: Optional[Progress] = None,
+        executor: Optional[Executor] = None,
+        **kwargs: Any,
+    ) -> 'AsyncAttack':
+        """
+        Load the dataset in an executor.
+
+        Args:
+            - progress: Called on the event loop with (phase, None) as each
+                loading phase starts, and (phase, seconds taken) once done
+            - executor: Executor to load in, default: the loop's executor
+            - *args, **kwargs: Passed to Attack
+
+        Returns:
+            The loaded & indexed AsyncAttack
+
+        Example:
+            >>> attack = await AsyncAttack.load(mitre_version='latest')
+        """
+        attack = cls(*args, **kwargs)
+        attack._executor = executor
+
+        await attack._build(attack, progress)
+        return attack
+
+    async def refresh(self, progress: Optional[Progress] = None) -> None:
+        """
+        Re-download the dataset if it changed, then re-parse & re-index it.
+
+        The current dataset keeps being served until the new one is ready.
+
+        Args:
+            - progress: Called on the event loop with (phase, None) as each
+                loading phase starts, and (phase, seconds taken) once done
+        """
+        fresh = copy.copy(self)
+        fresh._update = True
+        fresh._loaded = False
+        fresh._indexed = False
+        fresh._dataset = None
+
+        await self._build(fresh, progress)
+
+        self.clear_caches()
+        self.attack_objects = fresh.attack_objects
+        self.relationships = fresh.relationships
+        self.id_lookup = fresh.id_lookup
+        self.bytes_saved = fresh.bytes_saved
+        self._dataset = fresh._dataset
+        self._loaded = True
+        self._indexed = True
+
+    # -------------------------------------------------------------------------
+
+    async def _build(
+        self, attack: 'AsyncAttack', progress: Optional[Progress]
+    ) -> None:
+        """Load & index attack in the executor, reporting progress"""
+        loop = asyncio.get_running_loop()
+
+        if progress:
+            attack._progress = lambda phase, duration: (
+                loop.call_soon_threadsafe(progress, phase, duration)
+            )
+
+        try:
+            await loop.run_in_executor(self._executor, attack._index)
+        finally:
+            attack._progress = None
@@ -0,0 +1,99 @@
+# -----------------------------------------------------------------------------
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from typing import Any, Dict, Iterable, Optional
+
+import enterpriseattack
+
+# -----------------------------------------------------------------------------
+
+MAX_WORKERS = 4
+
+# -----------------------------------------------------------------------------
+# Load several versions of the dataset at once:
+# -----------------------------------------------------------------------------
+
+
+def load_versions(
+    mitre_versions: Iterable[str],
+    directory: Optional[str] = None,
+    url_template: str = enterpriseattack.utils.VERSION_URL,
+    max_workers: int = MAX_WORKERS,
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+    **kwargs: Any,
+) -> Dict[str, 'enterpriseattack.Attack']:
+    """
+    Fetch, parse & index several MITRE ATT&CK versions concurrently.
+
+    Versions are loaded by a pool of max_workers threads sharing one pooled
+    requests session, which retries failed requests with exponential
+    backoff. Each version is kept in its own file, so versions already
+    downloaded are read locally unless update=True.
+
+    Args:
+        - mitre_versions: ATT&CK versions to load, eg: ['v14', 'v15', 'latest']
+        - directory: Where to keep the version files, default: the package
+        - url_template: URL of a version, with a {version} placeholder
+        - max_workers: Versions loaded at the same time
+        - retries: Attempts after the first one for each request
+        - backoff_factor: Base of the exponential backoff, in seconds
+        - kwargs: Passed to Attack (update, include_deprecated etc)
+
+    Returns:
+        Dict of mitre_version to its loaded Attack
+
+    Raises:
+        enterpriseattack.Error: If any version could not be loaded
+    """
+    if not directory:
+        directory = path.dirname(path.realpath(__file__))
+
+    mitre_versions = list(dict.fromkeys(mitre_versions))
+    session = enterpriseattack.utils.make_session(
+        max_workers, retries, backoff_factor
+    )
+
+    attacks = {}
+    for mitre_version in mitre_versions:
+        version_kwargs = dict(kwargs)
+        if mitre_version != 'latest':
+            version_kwargs['url'] = enterpriseattack.utils.version_url(
+                mitre_version, url_template
+            )
+
+        attacks[mitre_version] = enterpriseattack.Attack(
+            enterprise_json=path.join(
+                directory, f'enterprise-attack-{mitre_version}.json'
+            ),
+            mitre_version=mitre_version,
+            lazy=True,
+            session=session,
+            **version_kwargs,
+        )
+
+    errors = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                mitre_version: executor.submit(attack._index)
+                for mitre_version, attack in attacks.items()
+            }
+
+            for mitre_version, future in futures.items():
+                try:
+                    future.result()
+                    logging.debug(f'Loaded ATT&CK version: {mitre_version}')
+                except enterpriseattack.Error as e:
+                    errors.append(f'{mitre_version} ({e})')
+    finally:
+        session.close()
+
+    if errors:
+        raise enterpriseattack.Error(
+            f'Unable to load versions: {", ".join(errors)}'
+        )
+
+    return attacks
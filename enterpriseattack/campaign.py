@@ -39,7 +39,9 @@ class Campaign:
             enterpriseattack.Error: When failing to return the to_json() method
         """
         self.relationships = relationships
-        self.id_lookup = id_lookup
+        self.id_lookup = enterpriseattack.utils.as_object_index(
+            attack_objects, id_lookup
+        )
         self.attack_objects = attack_objects
 
         self.id = enterpriseattack.utils.expand_external(
@@ -73,57 +75,49 @@ class Campaign:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def techniques(self) -> list:
         """Property to list techniques of the campaign"""
         from .technique import Technique
 
         techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for r_ in self.relationships.get(self.mid):
-                if r_.startswith('attack-pattern') and not self.id_lookup[
-                    r_
-                ].get('x_mitre_is_subtechnique'):
-                    techniques_.append(
-                        Technique(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **self.id_lookup[r_],
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'out', 'attack-pattern'
+        ):
+            if not attack_obj.get('x_mitre_is_subtechnique'):
+                techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, Technique, attack_obj
                     )
+                )
 
         return techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def sub_techniques(self) -> list:
         """Property to list sub techniques of the campaign"""
         from .sub_technique import SubTechnique
 
         sub_techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for r_ in self.relationships.get(self.mid):
-                if r_.startswith('attack-pattern') and self.id_lookup[r_].get(
-                    'x_mitre_is_subtechnique'
-                ):
-                    sub_techniques_.append(
-                        SubTechnique(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **self.id_lookup[r_],
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'out', 'attack-pattern'
+        ):
+            if attack_obj.get('x_mitre_is_subtechnique'):
+                sub_techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, SubTechnique, attack_obj
                     )
+                )
 
         return sub_techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tactics(self) -> list:
         """Property to list tactics of the campaign"""
 
@@ -137,99 +131,74 @@ class Campaign:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def software(self) -> list:
         """Property to list software of the campaign"""
         from .software import Software
 
         softwares_ = []
 
-        if self.relationships.get(self.mid):
-            for r_id in self.relationships.get(self.mid):
-                if self.id_lookup.get(r_id):
-                    if self.id_lookup.get(r_id).get('type') in [
-                        'tool',
-                        'malware',
-                    ]:
-                        softwares_.append(
-                            Software(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[r_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'out', enterpriseattack.utils.SOFTWARE
+        ):
+            softwares_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
 
         return softwares_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def malware(self) -> list:
         """Property to list malware of the campaign"""
         from .software import Software
 
         malware_ = []
 
-        if self.relationships.get(self.mid):
-            for r_id in self.relationships.get(self.mid):
-                if self.id_lookup.get(r_id):
-                    if self.id_lookup.get(r_id).get('type') == 'malware':
-                        malware_.append(
-                            Software(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[r_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'out', 'malware'
+        ):
+            malware_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
 
         return malware_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tools(self) -> list:
         """Property to list tools of the campaign"""
         from .software import Software
 
         tools_ = []
 
-        if self.relationships.get(self.mid):
-            for r_id in self.relationships.get(self.mid):
-                if self.id_lookup.get(r_id):
-                    if self.id_lookup.get(r_id).get('type') == 'tool':
-                        tools_.append(
-                            Software(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[r_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'out', 'tool'
+        ):
+            tools_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
+
         return tools_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def groups(self) -> list:
         """Property to list groups of the campaign"""
         from .group import Group
 
         groups_ = []
 
-        if self.relationships.get(self.mid):
-            for target_id in self.relationships.get(self.mid):
-                if target_id.startswith('intrusion-set'):
-                    if self.id_lookup.get(target_id):
-                        groups_.append(
-                            Group(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[target_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'attributed-to', 'out', 'intrusion-set'
+        ):
+            groups_.append(
+                enterpriseattack.identity.entity(self, Group, attack_obj)
+            )
+
         return groups_
 
     # -------------------------------------------------------------------------
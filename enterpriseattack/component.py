@@ -39,7 +39,9 @@ class Component:
             enterpriseattack.Error: When failing to return the to_json() method
         """
         self.relationships = relationships
-        self.id_lookup = id_lookup
+        self.id_lookup = enterpriseattack.utils.as_object_index(
+            attack_objects, id_lookup
+        )
         self.attack_objects = attack_objects
 
         self.id = enterpriseattack.utils.expand_external(
@@ -66,55 +68,47 @@ class Component:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def techniques(self) -> list:
         from .technique import Technique
 
         techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for r_ in self.relationships.get(self.mid):
-                if r_.startswith('attack-pattern') and not self.id_lookup[
-                    r_
-                ].get('x_mitre_is_subtechnique'):
-                    techniques_.append(
-                        Technique(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **self.id_lookup[r_],
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'detects', 'out', 'attack-pattern'
+        ):
+            if not attack_obj.get('x_mitre_is_subtechnique'):
+                techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, Technique, attack_obj
                     )
+                )
 
         return techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def sub_techniques(self) -> list:
         from .sub_technique import SubTechnique
 
         sub_techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for r_ in self.relationships.get(self.mid):
-                if r_.startswith('attack-pattern') and self.id_lookup[r_].get(
-                    'x_mitre_is_subtechnique'
-                ):
-                    sub_techniques_.append(
-                        SubTechnique(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **self.id_lookup[r_],
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'detects', 'out', 'attack-pattern'
+        ):
+            if attack_obj.get('x_mitre_is_subtechnique'):
+                sub_techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, SubTechnique, attack_obj
                     )
+                )
 
         return sub_techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tactics(self) -> list:
 
         tactics_ = []
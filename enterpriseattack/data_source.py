@@ -39,7 +39,9 @@ class DataSource:
             enterpriseattack.Error: When failing to return the to_json() method
         """
         self.relationships = relationships
-        self.id_lookup = id_lookup
+        self.id_lookup = enterpriseattack.utils.as_object_index(
+            attack_objects, id_lookup
+        )
         self.attack_objects = attack_objects
         self.id = enterpriseattack.utils.expand_external(
             kwargs.get('external_references'), 'external_id'
@@ -68,90 +70,76 @@ class DataSource:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def components(self) -> list:
         """Property to list components of the datasource"""
         from .component import Component
 
         components_ = []
 
-        if self.relationships.get(self.mid):
-            for r_ in self.relationships.get(self.mid):
-                if self.id_lookup[r_].get('type') == 'x-mitre-data-component':
-                    components_.append(
-                        Component(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **self.id_lookup[r_],
-                        )
-                    )
+        for attack_obj in self.id_lookup.related(
+            self.mid,
+            enterpriseattack.utils.DATA_SOURCE_REF,
+            'in',
+            'x-mitre-data-component',
+        ):
+            components_.append(
+                enterpriseattack.identity.entity(self, Component, attack_obj)
+            )
 
         return components_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def techniques(self) -> list:
         """Property to list techniques of the datasource"""
         from .technique import Technique
 
         techniques_ = []
-
-        if self.components:
-            for component in self.components:
-                if component.data_source_ref == self.mid:
-                    if self.relationships.get(component.id):
-                        for r_id in self.relationships.get(component.id):
-                            if self.id_lookup.get(r_id):
-                                if self.id_lookup.get(r_id).get(
-                                    'type'
-                                ) == 'attack-pattern' and not self.id_lookup.get(  # noqa: E501
-                                    r_id
-                                ).get(
-                                    'x_mitre_is_subtechnique'
-                                ):
-                                    techniques_.append(
-                                        Technique(
-                                            self.attack_objects,
-                                            self.relationships,
-                                            self.id_lookup,
-                                            **self.id_lookup[r_id],
-                                        )
-                                    )
+        seen = set()
+
+        for _, attack_objs in enterpriseattack.utils.detection_chain(
+            self.id_lookup, self.mid
+        ):
+            for attack_obj in attack_objs:
+                if attack_obj['id'] in seen:
+                    continue
+                seen.add(attack_obj['id'])
+
+                if not attack_obj.get('x_mitre_is_subtechnique'):
+                    techniques_.append(
+                        enterpriseattack.identity.entity(
+                            self, Technique, attack_obj
+                        )
+                    )
 
         return techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def sub_techniques(self) -> list:
         """Property to list sub_techniques of the data source"""
         from .sub_technique import SubTechnique
 
         sub_techniques_ = []
-
-        if self.components:
-            for component in self.components:
-                if component.data_source_ref == self.mid:
-                    if self.relationships.get(component.id):
-                        for r_id in self.relationships.get(component.id):
-                            if self.id_lookup.get(r_id):
-                                if self.id_lookup.get(r_id).get(
-                                    'type'
-                                ) == 'attack-pattern' and self.id_lookup.get(
-                                    r_id
-                                ).get(
-                                    'x_mitre_is_subtechnique'
-                                ):
-                                    sub_techniques_.append(
-                                        SubTechnique(
-                                            self.attack_objects,
-                                            self.relationships,
-                                            self.id_lookup,
-                                            **self.id_lookup[r_id],
-                                        )
-                                    )
+        seen = set()
+
+        for _, attack_objs in enterpriseattack.utils.detection_chain(
+            self.id_lookup, self.mid
+        ):
+            for attack_obj in attack_objs:
+                if attack_obj['id'] in seen:
+                    continue
+                seen.add(attack_obj['id'])
+
+                if attack_obj.get('x_mitre_is_subtechnique'):
+                    sub_techniques_.append(
+                        enterpriseattack.identity.entity(
+                            self, SubTechnique, attack_obj
+                        )
+                    )
 
         return sub_techniques_
 
@@ -0,0 +1,200 @@
+# -----------------------------------------------------------------------------
+
+import functools
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Optional, Type
+
+# -----------------------------------------------------------------------------
+# IdentityMap class:
+# -----------------------------------------------------------------------------
+
+
+class IdentityMap:
+
+    # -------------------------------------------------------------------------
+
+    def __init__(
+        self,
+        attack_objects: Mapping[str, Any],
+        relationships: Mapping[str, Any],
+        id_lookup: Mapping[str, Any],
+        maxsize: Optional[int] = None,
+    ) -> None:
+        """
+        Creates each entity of a dataset once, keyed by STIX id.
+
+        Entities are held weakly, so an entity is the same instance for as
+        long as something still uses it. The maxsize most recently used are
+        also kept alive, so they are reused between traversals. Entities
+        memoise the STIX ids of their relations until the map is cleared,
+        so they do not keep the related entities alive.
+
+        Args:
+            - attack_objects: The parsed MITRE ATT&CK dataset
+            - relationships: The source/target relationship mappings
+            - id_lookup: Key/values of id's to objects
+            - maxsize: Entities kept alive when unused, default: none
+        """
+        self.attack_objects = attack_objects
+        self.relationships = relationships
+        self.id_lookup = id_lookup
+        self.maxsize = maxsize
+
+        self.generation = 0
+
+        self._entities = weakref.WeakValueDictionary()
+        self._recent = OrderedDict()
+
+    # -------------------------------------------------------------------------
+
+    def get(self, entity_class: Type, attack_obj: Dict[str, Any]) -> Any:
+        """
+        Return the entity of an attack object, creating it if needed.
+
+        Args:
+            - entity_class: The entity class, eg: Technique
+            - attack_obj: The attack object
+
+        Returns:
+            The entity_class instance for the object's STIX id
+        """
+        return self.get_by_id(entity_class, attack_obj.get('id'), attack_obj)
+
+    def get_by_id(
+        self,
+        entity_class: Type,
+        stix_id: str,
+        attack_obj: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Return the entity of a STIX id, creating it if needed.
+
+        Args:
+            - entity_class: The entity class, eg: Technique
+            - stix_id: STIX id of the attack object
+            - attack_obj: The attack object, looked up if needed when None
+
+        Returns:
+            The entity_class instance for the STIX id
+        """
+        key = (entity_class, stix_id)
+
+        entity = self._entities.get(key)
+        if entity is None:
+            if attack_obj is None:
+                attack_obj = self.id_lookup[stix_id]
+            entity = entity_class(
+                self.attack_objects,
+                self.relationships,
+                self.id_lookup,
+                **attack_obj,
+            )
+            entity.identity_map = self
+            self._entities[key] = entity
+
+        if self.maxsize:
+            self._recent[key] = entity
+            self._recent.move_to_end(key)
+            if len(self._recent) > self.maxsize:
+                self._recent.popitem(last=False)
+
+        return entity
+
+    def clear(self) -> None:
+        """Forget every entity & memoised relation, they are recreated"""
+        self.generation += 1
+        self._entities = weakref.WeakValueDictionary()
+        self._recent.clear()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+
+# -----------------------------------------------------------------------------
+# Create the entities related to an entity:
+# -----------------------------------------------------------------------------
+
+
+def entity(owner: Any, entity_class: Type, attack_obj: Dict[str, Any]) -> Any:
+    """
+    Return the entity of an attack object related to owner.
+
+    The entity comes from owner's identity map when it has one, otherwise
+    a new one is created from owner's dataset.
+
+    Args:
+        - owner: The entity the attack object is related to
+        - entity_class: The entity class, eg: Technique
+        - attack_obj: The attack object
+
+    Returns:
+        The entity_class instance
+    """
+    identity_map = getattr(owner, 'identity_map', None)
+    if identity_map is not None:
+        return identity_map.get(entity_class, attack_obj)
+
+    return entity_class(
+        owner.attack_objects,
+        owner.relationships,
+        owner.id_lookup,
+        **attack_obj,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Memoise the relations of an entity:
+# -----------------------------------------------------------------------------
+
+
+def relation(method: Callable[[Any], List]) -> property:
+    """
+    A relation property, eg: Technique.groups, computed once per entity.
+
+    Entities from an identity map keep the STIX ids of the result until
+    the map is cleared. Each access returns a new list of their entities
+    from the map, so a memoised relation does not keep them alive and the
+    map's maxsize still bounds the entities held. Entities created by hand
+    compute it on every access.
+
+    Args:
+        - method: The property's getter
+
+    Returns:
+        The memoised property
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def getter(self: Any) -> List:
+        identity_map = getattr(self, 'identity_map', None)
+        if identity_map is None:
+            return method(self)
+
+        if self.__dict__.get('_generation') != identity_map.generation:
+            self._generation = identity_map.generation
+            self._relations = {}
+
+        relations = self._relations
+        if name not in relations:
+            relations[name] = [
+                (
+                    (type(related), related.mid)
+                    if related.mid
+                    and getattr(related, 'identity_map', None) is identity_map
+                    else related
+                )
+                for related in method(self)
+            ]
+
+        return [
+            (
+                identity_map.get_by_id(*related)
+                if isinstance(related, tuple)
+                else related
+            )
+            for related in relations[name]
+        ]
+
+    return property(getter)
@@ -39,7 +39,9 @@ class Mitigation:
             enterpriseattack.Error: When failing to return the to_json() method
         """
         self.relationships = relationships
-        self.id_lookup = id_lookup
+        self.id_lookup = enterpriseattack.utils.as_object_index(
+            attack_objects, id_lookup
+        )
         self.attack_objects = attack_objects
 
         self.id = enterpriseattack.utils.expand_external(
@@ -61,35 +63,28 @@ class Mitigation:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def techniques(self) -> list:
         """Property to list techniques of the mitigation object"""
         from .technique import Technique
 
         techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for target_id in self.relationships.get(self.mid):
-                if target_id.startswith(
-                    'attack-pattern'
-                ) and not self.id_lookup[target_id].get(
-                    'x_mitre_is_subtechnique'
-                ):
-                    if self.id_lookup.get(target_id):
-                        techniques_.append(
-                            Technique(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[target_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'mitigates', 'out', 'attack-pattern'
+        ):
+            if not attack_obj.get('x_mitre_is_subtechnique'):
+                techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, Technique, attack_obj
+                    )
+                )
 
         return techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tactics(self) -> list:
         """Property to list tactics of the mitigation object"""
 
@@ -0,0 +1,118 @@
+# -----------------------------------------------------------------------------
+
+import threading
+import weakref
+from typing import Any, Dict, Hashable, Mapping, Optional
+
+import enterpriseattack
+
+# -----------------------------------------------------------------------------
+
+_datasets = weakref.WeakValueDictionary()
+_locks = {}
+_registry_lock = threading.Lock()
+
+# -----------------------------------------------------------------------------
+# Dataset class:
+# -----------------------------------------------------------------------------
+
+
+class Dataset:
+
+    # -------------------------------------------------------------------------
+
+    def __init__(
+        self,
+        attack_objects: Mapping[str, Any],
+        relationships: Mapping[str, Any],
+        id_lookup: Mapping[str, Any],
+    ) -> None:
+        """
+        A parsed dataset & its indexes, shared read-only between Attacks.
+
+        They are frozen deeply, see utils.freeze(), so nested objects can
+        not be changed under the other Attacks either. Each Attack using
+        the dataset holds a reference to it, once there are none left it is
+        dropped from the registry.
+
+        Args:
+            - attack_objects: The parsed MITRE ATT&CK dataset
+            - relationships: The source/target relationship mappings
+            - id_lookup: Key/values of id's to objects
+        """
+        memo = {}
+        self.attack_objects = enterpriseattack.utils.freeze(
+            attack_objects, memo
+        )
+        self.relationships = enterpriseattack.utils.freeze(relationships, memo)
+        self.id_lookup = enterpriseattack.utils.freeze(id_lookup, memo)
+
+
+# -----------------------------------------------------------------------------
+# Registry of the datasets in use:
+# -----------------------------------------------------------------------------
+
+
+def lock(key: Hashable) -> threading.Lock:
+    """
+    Return the lock serialising loads of a dataset.
+
+    The lock is forgotten once the dataset is no longer used, see
+    register_dataset().
+
+    Args:
+        - key: The dataset key
+
+    Returns:
+        threading.Lock for the key
+    """
+    with _registry_lock:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def get_dataset(key: Hashable) -> Optional[Dataset]:
+    """
+    Return the dataset registered under key, if any Attack still uses it.
+
+    Args:
+        - key: The dataset key
+
+    Returns:
+        Dataset or None
+    """
+    with _registry_lock:
+        return _datasets.get(key)
+
+
+def register_dataset(key: Hashable, dataset: Dataset) -> Dataset:
+    """
+    Register a dataset, replacing any previous dataset under the same key.
+
+    Args:
+        - key: The dataset key
+        - dataset: The freshly loaded Dataset
+
+    Returns:
+        The registered Dataset
+    """
+    with _registry_lock:
+        _datasets[key] = dataset
+        weakref.finalize(dataset, _forget_lock, key)
+        return dataset
+
+
+def _forget_lock(key: Hashable) -> None:
+    """Drop the lock of a dataset that is no longer used, unless loading"""
+    key_lock = _locks.get(key)
+    if (
+        key_lock is not None
+        and not key_lock.locked()
+        and _datasets.get(key) is None
+    ):
+        _locks.pop(key, None)
+
+
+def datasets() -> Dict[Hashable, Dataset]:
+    """Return a snapshot of the registered datasets, by key"""
+    with _registry_lock:
+        return dict(_datasets.items())
@@ -0,0 +1,171 @@
+# -----------------------------------------------------------------------------
+
+import hashlib
+import logging
+import os
+import pickle  # nosec B403
+from typing import Any, Dict, Optional
+
+import enterpriseattack
+
+# -----------------------------------------------------------------------------
+
+SNAPSHOT_FORMAT = 8
+SNAPSHOT_SUFFIX = '.snapshot'
+
+# -----------------------------------------------------------------------------
+# Snapshot location & source hashing:
+# -----------------------------------------------------------------------------
+
+
+def snapshot_path(local_enterprise_json: str) -> str:
+    """
+    Return the path of the snapshot stored next to the local dataset.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+
+    Returns:
+        The snapshot file path
+    """
+    return f'{local_enterprise_json}{SNAPSHOT_SUFFIX}'
+
+
+def source_hash(local_enterprise_json: str) -> Optional[str]:
+    """
+    Hash the contents of the local dataset file.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+
+    Returns:
+        sha256 hex digest of the file, or None if it could not be read
+    """
+    digest = hashlib.sha256()
+
+    try:
+        with open(local_enterprise_json, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+
+    except OSError:
+        return None
+
+    return digest.hexdigest()
+
+
+def _snapshot_header(
+    local_enterprise_json: str, variant: Any = None
+) -> Dict[str, Any]:
+    """Return the header a valid snapshot of the local dataset must carry"""
+    return {
+        'format': SNAPSHOT_FORMAT,
+        'version': enterpriseattack.__version__,
+        'source_hash': source_hash(local_enterprise_json),
+        'variant': variant,
+    }
+
+
+# -----------------------------------------------------------------------------
+# Read a snapshot if it still matches the local dataset:
+# -----------------------------------------------------------------------------
+
+
+def read_snapshot(
+    local_enterprise_json: str, variant: Any = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Loads the parsed dataset and indexes from a snapshot.
+
+    The snapshot header is read first, and the payload is only unpickled
+    when the header matches the snapshot format, the library version, the
+    hash of the local dataset file and the load options (variant).
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+        - variant: Load options the snapshot must have been written with
+
+    Returns:
+        Dict of attack_objects, relationships & id_lookup, or None if the
+        snapshot is missing or stale
+    """
+    snapshot = snapshot_path(local_enterprise_json)
+
+    if not os.path.isfile(snapshot):
+        return None
+
+    header = _snapshot_header(local_enterprise_json, variant)
+
+    try:
+        with open(snapshot, 'rb') as f:
+            if pickle.load(f) != header:  # nosec B301
+                logging.debug(f'Snapshot is stale: {snapshot}')
+                return None
+
+            payload = pickle.load(f)  # nosec B301
+
+    except Exception as e:
+        logging.warning(f'Unable to read snapshot: {snapshot}, error: {e}')
+        return None
+
+    logging.debug(f'Successfully read snapshot: {snapshot}')
+    return payload
+
+
+# -----------------------------------------------------------------------------
+# Write a snapshot next to the local dataset:
+# -----------------------------------------------------------------------------
+
+
+def write_snapshot(
+    local_enterprise_json: str,
+    attack_objects: Dict[str, Any],
+    relationships: Dict[str, Any],
+    id_lookup: Dict[str, Any],
+    variant: Any = None,
+) -> bool:
+    """
+    Persists the parsed dataset and indexes next to the local dataset.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+        - attack_objects: The parsed MITRE ATT&CK dataset
+        - relationships: The source/target relationship mappings
+        - id_lookup: Key/values of id's to objects
+        - variant: Load options used to build the dataset (field projection)
+
+    Returns:
+        True if the snapshot was written, otherwise False
+    """
+    snapshot = snapshot_path(local_enterprise_json)
+
+    header = _snapshot_header(local_enterprise_json, variant)
+
+    if not header['source_hash']:
+        return False
+
+    payload = {
+        'attack_objects': attack_objects,
+        'relationships': relationships,
+        'id_lookup': id_lookup,
+    }
+
+    tmp_snapshot = f'{snapshot}.{os.getpid()}.tmp'
+
+    try:
+        with open(tmp_snapshot, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_snapshot, snapshot)
+
+    except Exception as e:
+        logging.warning(f'Unable to write snapshot: {snapshot}, error: {e}')
+
+        if os.path.exists(tmp_snapshot):
+            os.remove(tmp_snapshot)
+
+        return False
+
+    logging.debug(f'Successfully wrote snapshot: {snapshot}')
+    return True
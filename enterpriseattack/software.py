@@ -39,7 +39,9 @@ class Software:
             enterpriseattack.Error: When failing to return the to_json() method
         """
         self.relationships = relationships
-        self.id_lookup = id_lookup
+        self.id_lookup = enterpriseattack.utils.as_object_index(
+            attack_objects, id_lookup
+        )
         self.attack_objects = attack_objects
 
         self.id = enterpriseattack.utils.expand_external(
@@ -66,62 +68,49 @@ class Software:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def techniques(self) -> list:
         """Property to list techniques of the software object"""
         from .technique import Technique
 
         techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for target_id in self.relationships.get(self.mid):
-                if target_id.startswith(
-                    'attack-pattern'
-                ) and not self.id_lookup.get(target_id).get(
-                    'x_mitre_is_subtechnique'
-                ):
-                    techniques_.append(
-                        Technique(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **self.id_lookup[target_id],
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'out', 'attack-pattern'
+        ):
+            if not attack_obj.get('x_mitre_is_subtechnique'):
+                techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, Technique, attack_obj
                     )
+                )
 
         return techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def sub_techniques(self) -> list:
         """Property to list subtechniques of the software object"""
         from .sub_technique import SubTechnique
 
         sub_techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for target_id in self.relationships.get(self.mid):
-                if target_id.startswith(
-                    'attack-pattern'
-                ) and self.id_lookup.get(target_id).get(
-                    'x_mitre_is_subtechnique'
-                ):
-                    if self.id_lookup.get(target_id):
-                        sub_techniques_.append(
-                            SubTechnique(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[target_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'out', 'attack-pattern'
+        ):
+            if attack_obj.get('x_mitre_is_subtechnique'):
+                sub_techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, SubTechnique, attack_obj
+                    )
+                )
 
         return sub_techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tactics(self) -> list:
         """Property to list tactics of the software object"""
 
@@ -135,25 +124,20 @@ class Software:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def groups(self) -> list:
         """Property to list groups of the software object"""
         from .group import Group
 
         groups_ = []
 
-        if self.relationships.get(self.mid):
-            for target_id in self.relationships.get(self.mid):
-                if target_id.startswith('intrusion-set'):
-                    if self.id_lookup.get(target_id):
-                        groups_.append(
-                            Group(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[target_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', 'intrusion-set'
+        ):
+            groups_.append(
+                enterpriseattack.identity.entity(self, Group, attack_obj)
+            )
+
         return groups_
 
     # -------------------------------------------------------------------------
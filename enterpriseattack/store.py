@@ -0,0 +1,423 @@
+# -----------------------------------------------------------------------------
+
+import functools
+import logging
+import mmap
+import os
+import pickle  # nosec B403
+import struct
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import ujson
+
+import enterpriseattack
+
+# -----------------------------------------------------------------------------
+
+STORE_FORMAT = 7
+STORE_SUFFIX = '.store'
+STORE_MAGIC = b'EATTACKSTORE'
+STORE_PREAMBLE = struct.Struct(f'<{len(STORE_MAGIC)}sQ')
+RECORD_CACHE_SIZE = 1024
+
+# -----------------------------------------------------------------------------
+
+
+def store_path(local_enterprise_json: str) -> str:
+    """
+    Return the path of the object store kept next to the local dataset.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+
+    Returns:
+        The object store file path
+    """
+    return f'{local_enterprise_json}{STORE_SUFFIX}'
+
+
+def _store_header(
+    local_enterprise_json: str, variant: Any = None
+) -> Dict[str, Any]:
+    """Return the header a valid store of the local dataset must carry"""
+    return {
+        'format': STORE_FORMAT,
+        'version': enterpriseattack.__version__,
+        'source_hash': enterpriseattack.snapshot.source_hash(
+            local_enterprise_json
+        ),
+        'variant': variant,
+    }
+
+
+# -----------------------------------------------------------------------------
+# Write the object store:
+# -----------------------------------------------------------------------------
+
+
+def write_store(
+    local_enterprise_json: str,
+    attack_objects: Dict[str, Any],
+    relationships: Dict[str, List[str]],
+    variant: Any = None,
+    links: Optional[Dict[Tuple[str, str, str, str], List[str]]] = None,
+) -> bool:
+    """
+    Writes every object as its own json record, followed by an offset index.
+
+    The file layout is the magic bytes and the offset of the index, then
+    the json records, then the pickled index. The index maps STIX ids and
+    ATT&CK external ids to record offsets, and also holds the relationships.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+        - attack_objects: The parsed MITRE ATT&CK dataset
+        - relationships: The source/target relationship mappings
+        - variant: Load options used to build the dataset (field projection)
+        - links: The typed & directed relationships (ObjectIndex.links)
+
+    Returns:
+        True if the store was written, otherwise False
+    """
+    store = store_path(local_enterprise_json)
+    header = _store_header(local_enterprise_json, variant)
+
+    if not header['source_hash']:
+        return False
+
+    records = []
+    ids = {}
+    types = {}
+    phases = {}
+    names = {}
+    external_ids = {}
+    candidates = {}
+
+    tmp_store = f'{store}.{os.getpid()}.tmp'
+
+    try:
+        with open(tmp_store, 'wb') as f:
+            f.write(STORE_PREAMBLE.pack(STORE_MAGIC, 0))
+
+            for obj in attack_objects.get('objects', []):
+                record = ujson.dumps(obj, ensure_ascii=False).encode()
+                location = (f.tell(), len(record))
+                f.write(record)
+
+                records.append(location)
+
+                if obj.get('type') == 'relationship' or not obj.get('id'):
+                    continue
+
+                if obj['id'] not in ids:
+                    for obj_type in enterpriseattack.utils.index_types(
+                        obj.get('type')
+                    ):
+                        types.setdefault(obj_type, []).append(obj['id'])
+                    for key in enterpriseattack.utils.phase_keys(obj):
+                        phases.setdefault(key, []).append(obj['id'])
+                    if obj.get('name'):
+                        names.setdefault(
+                            (obj['name'], obj.get('type')), []
+                        ).append(obj['id'])
+                ids[obj['id']] = location
+
+                external_id = enterpriseattack.utils.expand_external(
+                    obj.get('external_references'), 'external_id'
+                )
+                if external_id:
+                    candidates.setdefault(external_id, []).append(obj)
+
+            # Some ATT&CK ids are shared, keep the best match of each:
+            for external_id, objs in candidates.items():
+                external_ids[external_id] = min(
+                    objs,
+                    key=functools.partial(
+                        enterpriseattack.utils.external_id_rank, external_id
+                    ),
+                )['id']
+
+            index_offset = f.tell()
+            pickle.dump(
+                {
+                    'header': header,
+                    'records': records,
+                    'ids': ids,
+                    'types': types,
+                    'phases': phases,
+                    'names': names,
+                    'external_ids': external_ids,
+                    'relationships': relationships,
+                    'links': links or {},
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+            f.seek(0)
+            f.write(STORE_PREAMBLE.pack(STORE_MAGIC, index_offset))
+
+        os.replace(tmp_store, store)
+
+    except Exception as e:
+        logging.warning(f'Unable to write object store: {store}, error: {e}')
+
+        if os.path.exists(tmp_store):
+            os.remove(tmp_store)
+
+        return False
+
+    logging.debug(f'Successfully wrote object store: {store}')
+    return True
+
+
+# -----------------------------------------------------------------------------
+# Open the object store:
+# -----------------------------------------------------------------------------
+
+
+def open_store(
+    local_enterprise_json: str, variant: Any = None
+) -> Optional['ObjectStore']:
+    """
+    Opens the object store if it still matches the local dataset.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+        - variant: Load options the store must have been written with
+
+    Returns:
+        ObjectStore, or None if the store is missing or stale
+    """
+    store = store_path(local_enterprise_json)
+
+    if not os.path.isfile(store):
+        return None
+
+    try:
+        object_store = ObjectStore(store)
+
+    except Exception as e:
+        logging.warning(f'Unable to open object store: {store}, error: {e}')
+        return None
+
+    if object_store.header != _store_header(local_enterprise_json, variant):
+        logging.debug(f'Object store is stale: {store}')
+        object_store.close()
+        return None
+
+    logging.debug(f'Successfully opened object store: {store}')
+    return object_store
+
+
+# -----------------------------------------------------------------------------
+# ObjectStore class:
+# -----------------------------------------------------------------------------
+
+
+class ObjectStore(Mapping):
+
+    # -------------------------------------------------------------------------
+
+    def __init__(self, store: str) -> None:
+        """
+        Memory-maps an object store, only its index is loaded up front.
+
+        The store is a read-only mapping of STIX id to object, in the same
+        shape as id_lookup (an ObjectIndex), decoding each record when it is
+        accessed.
+
+        Args:
+            - store: Path of the object store file
+
+        Raises:
+            enterpriseattack.Error: If the file is not an object store
+        """
+        with open(store, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_offset = STORE_PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != STORE_MAGIC or not index_offset:
+            self._mmap.close()
+            raise enterpriseattack.Error(f'Invalid object store: {store}')
+
+        index = pickle.loads(self._mmap[index_offset:])  # nosec B301
+
+        self.header = index['header']
+        self.relationships = index['relationships']
+        self._records = index['records']
+        self._ids = index['ids']
+        self.types = index.get('types', {})
+        self.links = index.get('links', {})
+        self.phases = index.get('phases', {})
+        self.names = index.get('names', {})
+        self._external_ids = index['external_ids']
+        self._cache = OrderedDict()
+
+    # -------------------------------------------------------------------------
+
+    def _decode(self, location: Tuple[int, int]) -> Dict[str, Any]:
+        offset, length = location
+        end = offset + length
+        return ujson.loads(self._mmap[offset:end])
+
+    def __getitem__(self, stix_id: str) -> Dict[str, Any]:
+        """Return the object for a STIX id, decoding it if not cached"""
+        obj = self._cache.get(stix_id)
+
+        if obj is None:
+            obj = self._decode(self._ids[stix_id])
+            self._cache[stix_id] = obj
+
+            if len(self._cache) > RECORD_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(stix_id)
+
+        return obj
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, stix_id: object) -> bool:
+        return stix_id in self._ids
+
+    # -------------------------------------------------------------------------
+
+    def external_id(self, external_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the object for an ATT&CK external id, eg: T1055.
+
+        Args:
+            - external_id: The ATT&CK id of the object
+
+        Returns:
+            The object, or None if there is no such id
+        """
+        stix_id = self._external_ids.get(external_id)
+        return self[stix_id] if stix_id else None
+
+    def of_type(self, *obj_types: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the objects of these STIX types, decoding only those.
+
+        Args:
+            - obj_types: STIX types, eg: 'x-mitre-tactic'
+
+        Returns:
+            Iterator of the objects of each type in turn, in dataset order
+        """
+        for obj_type in obj_types:
+            for stix_id in self.types.get(obj_type, ()):
+                yield self[stix_id]
+
+    def in_phase(
+        self, phase_name: str, *obj_types: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the objects in a kill chain phase, decoding only those.
+
+        Args:
+            - phase_name: The phase, a tactic's shortname, eg: 'execution'
+            - obj_types: STIX types, eg: 'attack-pattern', 'x-mitre-tactic'
+
+        Returns:
+            Iterator of the objects of each type in turn, in dataset order
+        """
+        for obj_type in obj_types:
+            for stix_id in self.phases.get((phase_name, obj_type), ()):
+                yield self[stix_id]
+
+    def named(self, name: str, *obj_types: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the objects with this name, decoding only those.
+
+        Args:
+            - name: The name of the objects, eg: 'Process'
+            - obj_types: STIX types, eg: 'x-mitre-data-source'
+
+        Returns:
+            Iterator of the objects of each type in turn, in dataset order
+        """
+        for obj_type in obj_types:
+            for stix_id in self.names.get((name, obj_type), ()):
+                yield self[stix_id]
+
+    def related(
+        self,
+        stix_id: str,
+        relationship_type: str,
+        direction: str,
+        *obj_types: str,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the objects related to an object, decoding only those.
+
+        Args:
+            - stix_id: STIX id of the object
+            - relationship_type: eg: 'uses', 'mitigates', 'detects'
+            - direction: 'out' where stix_id is the source_ref, 'in' where
+                it is the target_ref
+            - obj_types: STIX types of the related objects, eg: 'malware'
+
+        Returns:
+            Iterator of the related objects of each type in turn
+        """
+        for obj_type in obj_types:
+            key = (stix_id, relationship_type, direction, obj_type)
+            for related_id in self.links.get(key, ()):
+                if related_id in self._ids:
+                    yield self[related_id]
+
+    # -------------------------------------------------------------------------
+
+    @property
+    def objects(self) -> 'StoredObjects':
+        """A sequence over every record in the store, in dataset order"""
+        return StoredObjects(self)
+
+    # -------------------------------------------------------------------------
+
+    def close(self) -> None:
+        self._cache.clear()
+        self._mmap.close()
+
+
+# -----------------------------------------------------------------------------
+# StoredObjects class:
+# -----------------------------------------------------------------------------
+
+
+class StoredObjects(Sequence):
+
+    # -------------------------------------------------------------------------
+
+    def __init__(self, store: ObjectStore) -> None:
+        """
+        Stands in for attack_objects['objects'], decoding records on access.
+
+        Args:
+            - store: The ObjectStore to read records from
+        """
+        self._store = store
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self._store._decode(location)
+                for location in self._store._records[index]
+            ]
+
+        return self._store._decode(self._store._records[index])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for location in self._store._records:
+            yield self._store._decode(location)
+
+    def __len__(self) -> int:
+        return len(self._store._records)
@@ -39,7 +39,9 @@ class SubTechnique:
             enterpriseattack.Error: When failing to return the to_json() method
         """
         self.relationships = relationships
-        self.id_lookup = id_lookup
+        self.id_lookup = enterpriseattack.utils.as_object_index(
+            attack_objects, id_lookup
+        )
         self.attack_objects = attack_objects
 
         self.id = enterpriseattack.utils.expand_external(
@@ -68,87 +70,66 @@ class SubTechnique:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def datasources(self) -> list:
         """Property to list datasources of the subtechnique object."""
         from .data_source import DataSource
 
         datasources_ = []
 
-        if self.x_mitre_data_sources:
-            for attack_obj in self.attack_objects['objects']:
-                if attack_obj.get('type') == 'x-mitre-data-source':
-                    ds_ = [
-                        d_
-                        for d_ in self.x_mitre_data_sources
-                        if attack_obj.get('name') in d_
-                    ]
-                    if ds_:
-                        datasources_.append(
-                            DataSource(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
-                            )
-                        )
+        for name in enterpriseattack.utils.data_source_names(
+            self.x_mitre_data_sources
+        ):
+            for attack_obj in self.id_lookup.named(
+                name, 'x-mitre-data-source'
+            ):
+                datasources_.append(
+                    enterpriseattack.identity.entity(
+                        self, DataSource, attack_obj
+                    )
+                )
+
         return datasources_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def techniques(self) -> list:
         """Property to list techniques of the subtechnique object."""
         from .technique import Technique
 
         techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for r_id in self.relationships.get(self.mid):
-                if self.id_lookup.get(r_id):
-                    if self.id_lookup.get(r_id).get(
-                        'type'
-                    ) == 'attack-pattern' and not self.id_lookup.get(r_id).get(
-                        'x_mitre_is_subtechnique'
-                    ):
-                        techniques_.append(
-                            Technique(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[r_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'subtechnique-of', 'out', 'attack-pattern'
+        ):
+            techniques_.append(
+                enterpriseattack.identity.entity(self, Technique, attack_obj)
+            )
+
         return techniques_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def groups(self) -> list:
         """Property to list groups of the subtechnique object."""
         from .group import Group
 
         groups_ = []
 
-        if self.relationships.get(self.mid):
-            for r_id in self.relationships.get(self.mid):
-                if (
-                    self.id_lookup.get(r_id)
-                    and self.id_lookup.get(r_id).get('type') == 'intrusion-set'
-                ):
-                    groups_.append(
-                        Group(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **self.id_lookup[r_id],
-                        )
-                    )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', 'intrusion-set'
+        ):
+            groups_.append(
+                enterpriseattack.identity.entity(self, Group, attack_obj)
+            )
+
         return groups_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tactics(self) -> list:
         """Property to list tactics of the subtechnique object."""
 
@@ -163,116 +144,91 @@ class SubTechnique:
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def mitigations(self) -> list:
         """Property to list mitigations of the subtechnique object."""
         from .mitigation import Mitigation
 
         mitigations_ = []
 
-        if self.relationships.get(self.mid):
-            for r_id in self.relationships.get(self.mid):
-                if (
-                    self.id_lookup.get(r_id)
-                    and self.id_lookup.get(r_id).get('type')
-                    == 'course-of-action'
-                ):
-                    mitigations_.append(
-                        Mitigation(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **self.id_lookup[r_id],
-                        )
-                    )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'mitigates', 'in', 'course-of-action'
+        ):
+            mitigations_.append(
+                enterpriseattack.identity.entity(self, Mitigation, attack_obj)
+            )
 
         return mitigations_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def software(self) -> list:
         """Property to list software of the subtechnique object."""
         from .software import Software
 
         software_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') in ['tool', 'malware']:
-                software_.append(
-                    Software(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', enterpriseattack.utils.SOFTWARE
+        ):
+            software_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
 
         return software_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tools(self) -> list:
         """Property to list tools of the subtechnique object."""
         from .software import Software
 
         tools_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') == 'tool':
-                tools_.append(
-                    Software(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', 'tool'
+        ):
+            tools_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
 
         return tools_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def malware(self) -> list:
         """Property to list malware of the subtechnique object."""
         from .software import Software
 
         malware_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') == 'malware':
-                malware_.append(
-                    Software(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', 'malware'
+        ):
+            malware_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
 
         return malware_
 
     # -------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def components(self) -> list:
         """Property to list components of the subtechnique object."""
         from .component import Component
 
         components_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') == 'x-mitre-data-component':
-                components_.append(
-                    Component(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'detects', 'in', 'x-mitre-data-component'
+        ):
+            components_.append(
+                enterpriseattack.identity.entity(self, Component, attack_obj)
+            )
 
         return components_
 
@@ -39,7 +39,9 @@ class Tactic:
             enterpriseattack.Error: When failing to return the to_json() method
         """
         self.relationships = relationships
-        self.id_lookup = id_lookup
+        self.id_lookup = enterpriseattack.utils.as_object_index(
+            attack_objects, id_lookup
+        )
         self.attack_objects = attack_objects
 
         self.id = enterpriseattack.utils.expand_external(
@@ -62,63 +64,44 @@ class Tactic:
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def techniques(self) -> list:
         """Property to list techniques of the tactic object"""
         from .technique import Technique
 
         techniques_ = []
 
-        for attack_obj in self.attack_objects['objects']:
-
-            if attack_obj.get(
-                'type'
-            ) == 'attack-pattern' and not attack_obj.get(
-                'x_mitre_is_subtechnique'
-            ):
-                kill_chains = attack_obj.get('kill_chain_phases')
-
-                if enterpriseattack.utils.match_tactics(
-                    self.short_name, kill_chains
-                ):
-                    techniques_.append(
-                        Technique(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
-                        )
+        for attack_obj in self.id_lookup.in_phase(
+            self.short_name, 'attack-pattern'
+        ):
+            if not attack_obj.get('x_mitre_is_subtechnique'):
+                techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, Technique, attack_obj
                     )
+                )
+
         return techniques_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def sub_techniques(self) -> list:
         """Property to list sub_techniques of the tactic"""
         from .sub_technique import SubTechnique
 
         sub_techniques_ = []
 
-        for attack_obj in self.attack_objects['objects']:
-
-            if attack_obj.get('type') == 'attack-pattern' and attack_obj.get(
-                'x_mitre_is_subtechnique'
-            ):
-
-                kill_chains = attack_obj.get('kill_chain_phases')
-
-                if enterpriseattack.utils.match_tactics(
-                    self.short_name, kill_chains
-                ):
-                    sub_techniques_.append(
-                        SubTechnique(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
-                        )
+        for attack_obj in self.id_lookup.in_phase(
+            self.short_name, 'attack-pattern'
+        ):
+            if attack_obj.get('x_mitre_is_subtechnique'):
+                sub_techniques_.append(
+                    enterpriseattack.identity.entity(
+                        self, SubTechnique, attack_obj
                     )
+                )
+
         return sub_techniques_
 
     # -----------------------------------------------------------------------------
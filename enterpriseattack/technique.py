@@ -39,7 +39,9 @@ class Technique:
             enterpriseattack.Error: When failing to return the to_json() method
         """
         self.relationships = relationships
-        self.id_lookup = id_lookup
+        self.id_lookup = enterpriseattack.utils.as_object_index(
+            attack_objects, id_lookup
+        )
         self.attack_objects = attack_objects
 
         self.id = enterpriseattack.utils.expand_external(
@@ -69,201 +71,166 @@ class Technique:
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def groups(self) -> list:
         from .group import Group
 
         groups_ = []
 
-        if self.relationships.get(self.mid):
-            for r_id in self.relationships.get(self.mid):
-                if self.id_lookup.get(r_id):
-                    if self.id_lookup.get(r_id).get('type') == 'intrusion-set':
-                        groups_.append(
-                            Group(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[r_id],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', 'intrusion-set'
+        ):
+            groups_.append(
+                enterpriseattack.identity.entity(self, Group, attack_obj)
+            )
+
         return groups_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def sub_techniques(self) -> list:
         from .sub_technique import SubTechnique
 
         sub_techniques_ = []
 
-        if self.relationships.get(self.mid):
-            for r_ in self.relationships.get(self.mid):
-                if r_.startswith('attack-pattern'):
-                    if self.id_lookup.get(r_).get('x_mitre_is_subtechnique'):
-                        sub_techniques_.append(
-                            SubTechnique(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **self.id_lookup[r_],
-                            )
-                        )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'subtechnique-of', 'in', 'attack-pattern'
+        ):
+            sub_techniques_.append(
+                enterpriseattack.identity.entity(
+                    self, SubTechnique, attack_obj
+                )
+            )
 
         return sub_techniques_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def datasources(self) -> list:
         from .data_source import DataSource
 
         datasources_ = []
 
-        if self.x_mitre_data_sources:
-            for attack_obj in self.attack_objects['objects']:
-                if attack_obj.get('type') == 'x-mitre-data-source':
-                    ds_ = [
-                        d_
-                        for d_ in self.x_mitre_data_sources
-                        if attack_obj.get('name') in d_
-                    ]
-                    if ds_:
-                        datasources_.append(
-                            DataSource(
-                                self.attack_objects,
-                                self.relationships,
-                                self.id_lookup,
-                                **attack_obj,
-                            )
-                        )
+        for name in enterpriseattack.utils.data_source_names(
+            self.x_mitre_data_sources
+        ):
+            for attack_obj in self.id_lookup.named(
+                name, 'x-mitre-data-source'
+            ):
+                datasources_.append(
+                    enterpriseattack.identity.entity(
+                        self, DataSource, attack_obj
+                    )
+                )
+
         return datasources_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def components(self) -> list:
         from .component import Component
 
         components_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') == 'x-mitre-data-component':
-                components_.append(
-                    Component(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'detects', 'in', 'x-mitre-data-component'
+        ):
+            components_.append(
+                enterpriseattack.identity.entity(self, Component, attack_obj)
+            )
 
         return components_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tactics(self) -> list:
         from .tactic import Tactic
 
         tactics_ = []
 
-        for attack_obj in self.attack_objects['objects']:
-            if attack_obj.get('type') == 'x-mitre-tactic':
-                if enterpriseattack.utils.match_tactics(
-                    attack_obj.get('x_mitre_shortname'), self.kill_chain_phases
-                ):
-                    tactics_.append(
-                        Tactic(
-                            self.attack_objects,
-                            self.relationships,
-                            self.id_lookup,
-                            **attack_obj,
-                        )
-                    )
+        phase_names = dict.fromkeys(
+            phase.get('phase_name') for phase in self.kill_chain_phases or ()
+        )
+
+        for phase_name in phase_names:
+            for attack_obj in self.id_lookup.in_phase(
+                phase_name, 'x-mitre-tactic'
+            ):
+                tactics_.append(
+                    enterpriseattack.identity.entity(self, Tactic, attack_obj)
+                )
+
         return tactics_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def mitigations(self) -> list:
         from .mitigation import Mitigation
 
         mitigations_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') == 'course-of-action':
-                mitigations_.append(
-                    Mitigation(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'mitigates', 'in', 'course-of-action'
+        ):
+            mitigations_.append(
+                enterpriseattack.identity.entity(self, Mitigation, attack_obj)
+            )
 
         return mitigations_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def software(self) -> list:
         from .software import Software
 
         software_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') in ['tool', 'malware']:
-                software_.append(
-                    Software(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', enterpriseattack.utils.SOFTWARE
+        ):
+            software_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
 
         return software_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def malware(self) -> list:
         from .software import Software
 
         malware_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') == 'malware':
-                malware_.append(
-                    Software(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', 'malware'
+        ):
+            malware_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
 
         return malware_
 
     # -----------------------------------------------------------------------------
 
-    @property
+    @enterpriseattack.identity.relation
     def tools(self) -> list:
         from .software import Software
 
         tools_ = []
 
-        for r_ in self.relationships.get(self.mid):
-            if self.id_lookup[r_].get('type') == 'tool':
-                tools_.append(
-                    Software(
-                        self.attack_objects,
-                        self.relationships,
-                        self.id_lookup,
-                        **self.id_lookup[r_],
-                    )
-                )
+        for attack_obj in self.id_lookup.related(
+            self.mid, 'uses', 'in', 'tool'
+        ):
+            tools_.append(
+                enterpriseattack.identity.entity(self, Software, attack_obj)
+            )
 
         return tools_
 
@@ -1,50 +1,389 @@
 # -----------------------------------------------------------------------------
 
+import bz2
+import codecs
+import functools
+import gzip
+import importlib
+import json
 import logging
-from typing import Any, Dict, List, Tuple
+import lzma
+import os
+import sys
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-import requests
 import ujson
 
 import enterpriseattack
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+if TYPE_CHECKING:
+    import requests
+
+# -----------------------------------------------------------------------------
+
+CHUNK_SIZE = 1024 * 1024
+LATEST_URL = (
+    'https://raw.githubusercontent.com/mitre/cti/master/'
+    'enterprise-attack/enterprise-attack.json'
+)
+VERSION_URL = (
+    'https://raw.githubusercontent.com/mitre/cti/ATT%26CK-v{version}/'
+    'enterprise-attack/enterprise-attack.json'
+)
+METADATA_SUFFIX = '.meta'
+LOCK_SUFFIX = '.lock'
+
+# Json parsers, fastest first:
+JSON_BACKENDS = ('orjson', 'ujson', 'json')
+
+# Compressed local datasets, by file extension & leading magic bytes:
+COMPRESSION_EXTENSIONS = {'.gz': gzip, '.xz': lzma, '.bz2': bz2}
+COMPRESSION_MAGIC = {b'\x1f\x8b': gzip, b'\xfd7zXZ\x00': lzma, b'BZh': bz2}
+
+# Relationship type linking a data component to its data source:
+DATA_SOURCE_REF = 'x_mitre_data_source_ref'
+
+# Malware & tools are also indexed together under this type, so software is
+# found in dataset order:
+SOFTWARE = 'software'
+SOFTWARE_TYPES = ('malware', 'tool')
+
+# STIX types of each ATT&CK id prefix, eg: T1055 is an attack-pattern:
+EXTERNAL_ID_TYPES = {
+    'T': ('attack-pattern',),
+    'TA': ('x-mitre-tactic',),
+    'G': ('intrusion-set',),
+    'S': SOFTWARE_TYPES,
+    'M': ('course-of-action',),
+    'DS': ('x-mitre-data-source',),
+    'C': ('campaign',),
+}
+
+# -----------------------------------------------------------------------------
+# Open a local dataset, transparently (de)compressing gzip/xz/bz2:
+# -----------------------------------------------------------------------------
+
+
+def open_dataset(local_enterprise_json: str, mode: str = 'rb') -> IO[bytes]:
+    """
+    Opens the local dataset file, compressed or not.
+
+    When writing, the compression is chosen by the file extension (.gz, .xz
+    or .bz2). When reading, the leading magic bytes are checked as well, so a
+    compressed file is decompressed as it is read whatever its name.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+        - mode: 'rb' or 'wb'
+
+    Returns:
+        A binary file object
+    """
+    ext = os.path.splitext(local_enterprise_json)[1].lower()
+    compressor = COMPRESSION_EXTENSIONS.get(ext)
+
+    if 'r' in mode:
+        with open(local_enterprise_json, 'rb') as f:
+            magic = f.read(6)
+
+        compressor = next(
+            (
+                module
+                for prefix, module in COMPRESSION_MAGIC.items()
+                if magic.startswith(prefix)
+            ),
+            None,
+        )
+
+    if compressor:
+        return compressor.open(local_enterprise_json, mode)
+
+    return open(local_enterprise_json, mode)
+
+
+# -----------------------------------------------------------------------------
+# Parse json with orjson, ujson or json, whichever is fastest & installed:
+# -----------------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=None)
+def json_loads(json_backend: Optional[str] = None) -> Callable[[bytes], Any]:
+    """
+    Returns the loads function of a json backend, which parses bytes as is.
+
+    Args:
+        - json_backend: 'orjson', 'ujson' or 'json', default: the first of
+            these that is installed
+
+    Returns:
+        The backend's loads function
+
+    Raises:
+        enterpriseattack.Error: If the backend is unknown or not installed
+    """
+    if json_backend and json_backend not in JSON_BACKENDS:
+        raise enterpriseattack.Error(f'Unknown json backend: {json_backend}')
+
+    for name in (json_backend,) if json_backend else JSON_BACKENDS:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+
+        logging.debug(f'Using json backend: {name}')
+        return module.loads
+
+    raise enterpriseattack.Error(
+        f'Json backend is not installed: {json_backend}'
+    )
+
+
+# -----------------------------------------------------------------------------
+# Sidecar metadata holding the HTTP validators of the last download:
+# -----------------------------------------------------------------------------
+
+
+def read_metadata(local_enterprise_json: str) -> Dict[str, Any]:
+    """
+    Reads the sidecar metadata saved next to the local dataset.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+
+    Returns:
+        Dict of the url, etag & last_modified of the last download, or an
+        empty dict if there is no usable metadata
+    """
+    try:
+        with open(f'{local_enterprise_json}{METADATA_SUFFIX}', 'r') as f:
+            metadata = ujson.load(f)
+
+    except (OSError, ValueError):
+        return {}
+
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def write_metadata(
+    local_enterprise_json: str, metadata: Dict[str, Any]
+) -> None:
+    """
+    Saves the sidecar metadata next to the local dataset.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+        - metadata: The url, etag & last_modified of the download
+    """
+    metadata_file = f'{local_enterprise_json}{METADATA_SUFFIX}'
+    tmp_metadata_file = f'{metadata_file}.{os.getpid()}.tmp'
+
+    try:
+        with open(tmp_metadata_file, 'w') as f:
+            ujson.dump(metadata, f)
+        os.replace(tmp_metadata_file, metadata_file)
+
+    except OSError as e:
+        logging.warning(f'Unable to write download metadata, error: {e}')
+
+        if os.path.exists(tmp_metadata_file):
+            os.remove(tmp_metadata_file)
+
+
+# -----------------------------------------------------------------------------
+# Lock the local dataset across processes while downloading it:
+# -----------------------------------------------------------------------------
+
+
+@contextmanager
+def file_lock(local_enterprise_json: str) -> Iterator[None]:
+    """
+    Holds an exclusive lock on a lock file next to the local dataset.
+
+    Other processes & threads wait until it is released. If the lock file
+    cannot be created (eg: read-only directory), it carries on unlocked.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+    """
+    lock_file = f'{local_enterprise_json}{LOCK_SUFFIX}'
+
+    try:
+        f = open(lock_file, 'a+b')
+    except OSError as e:
+        logging.warning(f'Unable to lock: {lock_file}, error: {e}')
+        yield
+        return
+
+    with f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _file_signature(local_enterprise_json: str) -> Optional[Tuple[int, int]]:
+    """Return the (mtime, size) of a file, to tell if it was replaced"""
+    try:
+        stat = os.stat(local_enterprise_json)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 # -----------------------------------------------------------------------------
 # Download MITRE ATT&CK Dataset from GitHub:
 # -----------------------------------------------------------------------------
 
 
 def download(
-    url: str, local_enterprise_json: str, **kwargs: Any
-) -> bool | None:
+    url: str,
+    local_enterprise_json: str,
+    json_backend: Optional[str] = None,
+    **kwargs: Any,
+) -> Dict[str, Any] | None:
     """
     Downloads the MITRE ATT&CK Dataset from https://github.com/mitre/cti.
 
+    The response body is streamed to a temporary file in chunks, parsed once
+    to validate it, and only then moved over the local dataset. The bytes are
+    saved exactly as served, rather than being re-serialised, and compressed
+    on the fly when the local file ends in .gz, .xz or .bz2. The received
+    bytes are kept in memory until parsed, so the file is never read back.
+
+    If the local dataset was downloaded from the same url before, the saved
+    ETag/Last-Modified validators are sent, so an unchanged dataset costs a
+    single 304 round trip.
+
+    Downloads of the same local dataset are serialised by a lock file. A
+    process that waited for another one to download it reuses that copy,
+    so many processes starting at once download it once.
+
     Args:
         - url: The URL to the json dataset
         - local_enterprise_json: The name of the file to save locally
-        - kwargs: Options for downloading (proxies etc)
+        - json_backend: Json parser to use, see json_loads()
+        - kwargs: Options for downloading (proxies, a requests session to
+            reuse pooled connections etc)
 
     Returns:
-        True if successful, otherwise None
+        attack_objects (dict): The parsed dataset, or None if the local
+        dataset is still current
 
     Raises:
         enterpriseattack.Error for: Invalid json reply, file did not write to
         disk or failed to connect to the URL
     """
+    signature = _file_signature(local_enterprise_json)
+
+    with file_lock(local_enterprise_json):
+        if (
+            _file_signature(local_enterprise_json) != signature
+            and read_metadata(local_enterprise_json).get('url') == url
+        ):
+            logging.debug(f'Dataset was downloaded by another process: {url}')
+            return None
+
+        return _fetch(url, local_enterprise_json, json_backend, **kwargs)
+
+
+def _fetch(
+    url: str,
+    local_enterprise_json: str,
+    json_backend: Optional[str] = None,
+    **kwargs: Any,
+) -> Dict[str, Any] | None:
+    """Downloads the dataset, see download(), the lock must be held"""
     logging.debug(f'Downloading dataset: {url}')
 
+    headers = {'Content-Type': 'application/json'}
+
+    # Revalidate the local copy, rather than fetching it again:
+    metadata = read_metadata(local_enterprise_json)
+    if metadata.get('url') == url and os.path.isfile(local_enterprise_json):
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+
+    # Only imported when downloading, as it is slow to import:
+    import requests
+
     try:
-        r = requests.get(
+        r = (kwargs.get('session') or requests).get(
             url,
-            headers={'Content-Type': 'application/json'},
+            headers=headers,
             proxies=kwargs.get('proxies'),
+            stream=True,
         )
 
+        if r.status_code == 304:
+            r.close()
+            logging.debug(f'Dataset not modified since last download: {url}')
+            return None
+
         if r.ok:
+            root, ext = os.path.splitext(local_enterprise_json)
+            tmp_enterprise_json = f'{root}.{os.getpid()}.download{ext}'
+            body = bytearray()
+
             try:
-                with open(local_enterprise_json, 'w') as f:
-                    ujson.dump(r.json(), f, indent=4)
-                    return True
+                with open_dataset(tmp_enterprise_json, 'wb') as f:
+                    for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                        body.extend(chunk)
+
+                attack_objects = json_loads(json_backend)(body)
+                del body
+
+                if not isinstance(attack_objects, dict):
+                    raise ValueError('Expected a json object')
+
+                os.replace(tmp_enterprise_json, local_enterprise_json)
+                write_metadata(
+                    local_enterprise_json,
+                    {
+                        'url': url,
+                        'etag': r.headers.get('ETag'),
+                        'last_modified': r.headers.get('Last-Modified'),
+                    },
+                )
+                return attack_objects
 
             except (AttributeError, ValueError, TypeError) as e:
                 logging.error(
@@ -61,6 +400,12 @@ def download(
                     '- Unable to create file, change directory?'
                 )
 
+            finally:
+                r.close()
+
+                if os.path.exists(tmp_enterprise_json):
+                    os.remove(tmp_enterprise_json)
+
         logging.error(f'Failed to connect to: {url}')
         raise enterpriseattack.Error(f'Failed to connect to: {url}')
 
@@ -69,6 +414,55 @@ def download(
         raise enterpriseattack.Error(f'Failed to connect to: {url} error: {e}')
 
 
+def version_url(mitre_version: str, url_template: str = VERSION_URL) -> str:
+    """
+    Return the URL of a specific MITRE ATT&CK version of the dataset.
+
+    Args:
+        - mitre_version: The ATT&CK version, eg: 'v15' or '15.1'
+        - url_template: URL with a {version} placeholder
+
+    Returns:
+        The dataset URL
+    """
+    return url_template.format(version=mitre_version.replace('v', ''))
+
+
+def make_session(
+    pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5
+) -> 'requests.Session':
+    """
+    Return a requests session with a connection pool, retrying with backoff.
+
+    Connection errors and 429/5xx replies are retried, sleeping
+    backoff_factor * 2 ** (retry - 1) seconds in between.
+
+    Args:
+        - pool_size: Connections kept open per host
+        - retries: Attempts after the first one
+        - backoff_factor: Base of the exponential backoff, in seconds
+
+    Returns:
+        requests.Session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter, Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
 # -----------------------------------------------------------------------------
 # Reads the local copy of ATT&CK dataset or updates it:
 # -----------------------------------------------------------------------------
@@ -78,15 +472,20 @@ def read_json(
     enterprise_url: str,
     local_enterprise_json: str,
     update: bool,
+    json_backend: Optional[str] = None,
     **kwargs: Any,
 ) -> dict:
     """
     Reads the local MITRE ATT&CK json dataset and optionally updates.
 
+    The file is read as bytes and handed to the json backend as is, without
+    decoding it to a str first.
+
     Args:
         - enterprise_url: URL to the dataset to download if updating
         - local_enterprise_json: Name of the local dataset file
         - update: Optional update to download a fresh dataset
+        - json_backend: Json parser to use, see json_loads()
         - kwargs: Options for downloading (proxies etc)
 
     Returns:
@@ -102,8 +501,8 @@ def read_json(
                 f'Attempting to read local json: {local_enterprise_json}'
             )
 
-            with open(local_enterprise_json, 'r') as f:
-                attack_objects = ujson.load(f)
+            with open_dataset(local_enterprise_json, 'rb') as f:
+                attack_objects = json_loads(json_backend)(f.read())
                 logging.debug('Successfully read local json')
 
             return attack_objects
@@ -115,25 +514,32 @@ def read_json(
                 'attempting to download new dataset'
             )
             return read_json(
-                enterprise_url, local_enterprise_json, update=True, **kwargs
+                enterprise_url,
+                local_enterprise_json,
+                update=True,
+                json_backend=json_backend,
+                **kwargs,
             )
 
-    # If update was true, re-download the json:
-    downloaded = download(
+    # If update was true, re-download the json, which is parsed as it lands:
+    attack_objects = download(
         url=enterprise_url,
         local_enterprise_json=local_enterprise_json,
+        json_backend=json_backend,
         **kwargs,
     )
 
-    if downloaded:
+    # Not modified since the last download, so read the local copy:
+    if attack_objects is None:
         return read_json(
             enterprise_url,
             local_enterprise_json,
             update=False,
+            json_backend=json_backend,
             **kwargs,
         )
 
-    return None
+    return attack_objects
 
 
 # -----------------------------------------------------------------------------
@@ -150,7 +556,7 @@ def expand_external(ext_list: list[dict] | None, key_name: str) -> Any | None:
     Returns:
         First found value for key_name, or None if not found
     """
-    if not isinstance(ext_list, list):
+    if not isinstance(ext_list, (list, tuple)):
         return None
 
     return next((obj[key_name] for obj in ext_list if key_name in obj), None)
@@ -171,7 +577,7 @@ def obtain_sources(ext_list: list[dict] | None) -> list[dict] | None:
     Returns:
         List of dicts containing 'description' keys, or None
     """
-    if not isinstance(ext_list, list):
+    if not isinstance(ext_list, (list, tuple)):
         return None
 
     return [obj for obj in ext_list if 'description' in obj]
@@ -195,7 +601,7 @@ def match_tactics(
     Returns:
         True if match found, None if no match or invalid input
     """
-    if not isinstance(kill_chain_phases, list):
+    if not isinstance(kill_chain_phases, (list, tuple)):
         return None
 
     for phase in kill_chain_phases:
@@ -205,6 +611,620 @@ def match_tactics(
     return None
 
 
+# -----------------------------------------------------------------------------
+# Field projection, to drop heavy fields at ingest:
+# -----------------------------------------------------------------------------
+
+# Fields the indexes & relation properties rely on, these are never dropped:
+REQUIRED_FIELDS = frozenset(
+    {
+        'id',
+        'type',
+        'name',
+        'modified',
+        'revoked',
+        'kill_chain_phases',
+        'relationship_type',
+        'source_ref',
+        'target_ref',
+        'x_mitre_data_source_ref',
+        'x_mitre_data_sources',
+        'x_mitre_deprecated',
+        'x_mitre_is_subtechnique',
+        'x_mitre_shortname',
+    }
+)
+
+
+def make_projection(
+    fields: Optional[Iterable[str]] = None,
+    exclude_fields: Optional[Iterable[str]] = None,
+) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    Build a function that strips unwanted fields from an attack object.
+
+    When external_references is dropped, the ATT&CK reference is kept in a
+    compact form, so the id & url of each object still resolve.
+
+    Args:
+        fields: Only keep these fields (plus REQUIRED_FIELDS)
+        exclude_fields: Drop these fields (except REQUIRED_FIELDS)
+
+    Returns:
+        The projection function, or None when nothing is dropped
+    """
+    if fields is None and not exclude_fields:
+        return None
+
+    keep = None if fields is None else set(fields) | REQUIRED_FIELDS
+    exclude = set(exclude_fields or ()) - REQUIRED_FIELDS
+
+    def project(obj: Dict[str, Any]) -> Dict[str, Any]:
+        drop = [
+            key
+            for key in obj
+            if key in exclude or (keep is not None and key not in keep)
+        ]
+
+        for key in drop:
+            value = obj.pop(key)
+
+            if key == 'external_references' and isinstance(
+                value, (list, tuple)
+            ):
+                ref = next((r for r in value if 'external_id' in r), None)
+                if ref:
+                    obj[key] = [
+                        {
+                            k: ref[k]
+                            for k in ('source_name', 'external_id', 'url')
+                            if k in ref
+                        }
+                    ]
+
+        return obj
+
+    return project
+
+
+def transform_objects(
+    attack_objects: Dict[str, Any],
+    transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """
+    Apply an ingest transform (projection, dedupe) to every attack object.
+
+    Args:
+        attack_objects: Dict containing 'objects' list of attack objects
+        transform: Callable taking & returning an attack object, or None
+
+    Returns:
+        The same attack_objects, with its objects transformed
+    """
+    if transform and isinstance(attack_objects.get('objects'), list):
+        attack_objects['objects'] = [
+            transform(obj) for obj in attack_objects['objects']
+        ]
+
+    return attack_objects
+
+
+def chain_transforms(
+    *transforms: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]],
+) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    Combine ingest transforms into one, skipping any that are None.
+
+    Args:
+        transforms: Callables taking & returning an attack object
+
+    Returns:
+        A callable applying each transform in order, or None
+    """
+    transforms = [t for t in transforms if t]
+
+    if len(transforms) < 2:
+        return transforms[0] if transforms else None
+
+    def transform(obj: Dict[str, Any]) -> Dict[str, Any]:
+        for t in transforms:
+            obj = t(obj)
+        return obj
+
+    return transform
+
+
+# -----------------------------------------------------------------------------
+# Share repeated strings, lists & dicts across the dataset:
+# -----------------------------------------------------------------------------
+
+# Longer strings are mostly unique prose, so are not worth sharing:
+MAX_SHARED_LENGTH = 128
+
+
+class FrozenDict(dict):
+    """An immutable, hashable dict, so identical values can be shared"""
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(f'{self.__class__.__name__} is immutable')
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict[str, Any]]]:
+        return (self.__class__, (dict(self),))
+
+
+SHAREABLE_TYPES = (str, tuple, FrozenDict)
+
+
+class Deduplicator:
+
+    # -------------------------------------------------------------------------
+
+    def __init__(self) -> None:
+        """
+        Ingest transform sharing identical values between attack objects.
+
+        Keys are interned, repeated strings are shared, lists become tuples
+        and nested dicts become FrozenDicts, with identical ones shared. The
+        table of seen values only lives as long as this object.
+        """
+        self._values = {}
+        self.bytes_saved = 0
+
+    def __call__(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        return {sys.intern(k): self._share(v) for k, v in obj.items()}
+
+    # -------------------------------------------------------------------------
+
+    def _share(self, value: Any) -> Any:
+        """Return the shared copy of value, adding it if it is new"""
+        if isinstance(value, str):
+            if len(value) > MAX_SHARED_LENGTH:
+                return value
+
+        elif isinstance(value, list):
+            value = tuple(self._share(v) for v in value)
+
+        elif isinstance(value, dict):
+            value = FrozenDict(
+                {sys.intern(k): self._share(v) for k, v in value.items()}
+            )
+
+        else:
+            return value
+
+        # Only share containers of strings & containers, as eg: 1 == True:
+        if not isinstance(value, str):
+            children = value.values() if isinstance(value, dict) else value
+            if not all(type(v) in SHAREABLE_TYPES for v in children):
+                return value
+
+        shared = self._values.setdefault(value, value)
+        if shared is not value:
+            self.bytes_saved += sys.getsizeof(value)
+
+        return shared
+
+
+def freeze(value: Any, memo: Optional[Dict[int, Any]] = None) -> Any:
+    """
+    Return an immutable deep copy, dicts become FrozenDicts & lists tuples.
+
+    Values reached more than once are frozen once, so an object in
+    id_lookup is still the same object as in attack_objects.
+
+    Args:
+        - value: The value to freeze
+        - memo: Values already frozen, by id, to share between calls
+
+    Returns:
+        The frozen value
+    """
+    if memo is None:
+        memo = {}
+
+    frozen = memo.get(id(value))
+    if frozen is not None:
+        return frozen
+
+    if isinstance(value, ObjectIndex):
+        frozen = ObjectIndex({k: freeze(v, memo) for k, v in value.items()})
+        for name, index in vars(value).items():
+            setattr(frozen, name, freeze(index, memo))
+        frozen.read_only = True
+    elif isinstance(value, (dict, MappingProxyType)):
+        frozen = FrozenDict({k: freeze(v, memo) for k, v in value.items()})
+    elif isinstance(value, (list, tuple)):
+        frozen = tuple(freeze(v, memo) for v in value)
+    else:
+        return value
+
+    memo[id(value)] = frozen
+    return frozen
+
+
+# -----------------------------------------------------------------------------
+# ObjectIndex class:
+# -----------------------------------------------------------------------------
+
+
+class ObjectIndex(dict):
+
+    # Class default, so unpickling can set items before the instance state:
+    read_only = False
+
+    # -------------------------------------------------------------------------
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        The id_lookup, a dict of STIX id to attack object.
+
+        Objects added with add() are also indexed by STIX type, in dataset
+        order, so all objects of a type are found without a full scan.
+        Malware & tools are indexed together as 'software' as well.
+        Relationships added with link() are kept by the id at either end,
+        their relationship_type & direction, and the type of the other end,
+        so related objects are found without filtering every neighbour.
+        Their ATT&CK ids (eg: T1055) are indexed too, and so are their kill
+        chain phases: a tactic by its shortname, a technique by each of its
+        kill_chain_phases, and by name. It becomes read-only once shared or
+        frozen.
+        """
+        super().__init__(*args, **kwargs)
+        self.types = {}
+        self.links = {}
+        self.external_ids = {}
+        self.phases = {}
+        self.names = {}
+
+    def _writable(self) -> None:
+        if self.read_only:
+            raise TypeError(f'{self.__class__.__name__} is read-only')
+
+    def __setitem__(self, key: str, value: Dict[str, Any]) -> None:
+        self._writable()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._writable()
+        super().__delitem__(key)
+
+    def pop(self, *args: Any) -> Any:
+        self._writable()
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[str, Dict[str, Any]]:
+        self._writable()
+        return super().popitem()
+
+    def setdefault(self, *args: Any) -> Any:
+        self._writable()
+        return super().setdefault(*args)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._writable()
+        super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        self._writable()
+        super().clear()
+        for index in (
+            self.types,
+            self.links,
+            self.external_ids,
+            self.phases,
+            self.names,
+        ):
+            index.clear()
+
+    # -------------------------------------------------------------------------
+
+    def add(self, obj: Dict[str, Any]) -> None:
+        """Add an attack object, indexing it by type & ATT&CK id"""
+        obj_id = obj['id']
+
+        if obj_id not in self:
+            for obj_type in index_types(obj.get('type')):
+                self.types.setdefault(obj_type, []).append(obj_id)
+
+            external_id = expand_external(
+                obj.get('external_references'), 'external_id'
+            )
+            if external_id:
+                self.external_ids.setdefault(external_id, []).append(obj_id)
+
+            for key in phase_keys(obj):
+                self.phases.setdefault(key, []).append(obj_id)
+
+            if obj.get('name'):
+                key = (obj['name'], obj.get('type'))
+                self.names.setdefault(key, []).append(obj_id)
+
+        self[obj_id] = obj
+
+    def discard(self, obj: Dict[str, Any]) -> None:
+        """Remove an attack object & its index entries, if present"""
+        obj_id = obj['id']
+
+        if self.pop(obj_id, None) is None:
+            return
+
+        keys = [(self.types, key) for key in index_types(obj.get('type'))]
+        keys += [(self.phases, key) for key in phase_keys(obj)]
+        keys.append((self.names, (obj.get('name'), obj.get('type'))))
+        keys.append(
+            (
+                self.external_ids,
+                expand_external(obj.get('external_references'), 'external_id'),
+            )
+        )
+
+        for index, key in keys:
+            ids = index.get(key)
+            if ids and obj_id in ids:
+                ids.remove(obj_id)
+                if not ids:
+                    del index[key]
+
+    def of_type(self, *obj_types: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the attack objects of these STIX types.
+
+        Args:
+            - obj_types: STIX types, eg: 'x-mitre-tactic'
+
+        Returns:
+            Iterator of the objects of each type in turn, in dataset order
+        """
+        for obj_type in obj_types:
+            for obj_id in self.types.get(obj_type, ()):
+                yield self[obj_id]
+
+    def external_id(self, external_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the attack object for an ATT&CK external id, eg: T1055.
+
+        Some ids are shared, eg: deprecated mitigations carry the ids of
+        their techniques, so the best match is chosen, see
+        external_id_rank().
+
+        Args:
+            - external_id: The ATT&CK id of the object
+
+        Returns:
+            The object, or None if there is no such id
+        """
+        return min(
+            (
+                self[obj_id]
+                for obj_id in self.external_ids.get(external_id, ())
+            ),
+            key=lambda obj: external_id_rank(external_id, obj),
+            default=None,
+        )
+
+    def in_phase(
+        self, phase_name: str, *obj_types: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the attack objects in a kill chain phase.
+
+        Args:
+            - phase_name: The phase, a tactic's shortname, eg: 'execution'
+            - obj_types: STIX types, eg: 'attack-pattern', 'x-mitre-tactic'
+
+        Returns:
+            Iterator of the objects of each type in turn, in dataset order
+        """
+        for obj_type in obj_types:
+            for obj_id in self.phases.get((phase_name, obj_type), ()):
+                yield self[obj_id]
+
+    def named(self, name: str, *obj_types: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the attack objects with this name.
+
+        Args:
+            - name: The name of the objects, eg: 'Process'
+            - obj_types: STIX types, eg: 'x-mitre-data-source'
+
+        Returns:
+            Iterator of the objects of each type in turn, in dataset order
+        """
+        for obj_type in obj_types:
+            for obj_id in self.names.get((name, obj_type), ()):
+                yield self[obj_id]
+
+    def link(self, relationship_type: str, source: str, target: str) -> None:
+        """Index a relationship from source to target, at both ends"""
+        self._writable()
+
+        for key, related_id in link_keys(relationship_type, source, target):
+            self.links.setdefault(key, []).append(related_id)
+
+    def unlink(self, relationship_type: str, source: str, target: str) -> None:
+        """Remove a relationship added with link(), if present"""
+        self._writable()
+
+        for key, related_id in link_keys(relationship_type, source, target):
+            related = self.links.get(key)
+            if related and related_id in related:
+                related.remove(related_id)
+                if not related:
+                    del self.links[key]
+
+    def related(
+        self,
+        obj_id: str,
+        relationship_type: str,
+        direction: str,
+        *obj_types: str,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate the attack objects related to an object.
+
+        Args:
+            - obj_id: STIX id of the object
+            - relationship_type: eg: 'uses', 'mitigates', 'detects'
+            - direction: 'out' where obj_id is the source_ref, 'in' where it
+                is the target_ref
+            - obj_types: STIX types of the related objects, eg: 'malware'
+
+        Returns:
+            Iterator of the related objects of each type in turn
+        """
+        for obj_type in obj_types:
+            key = (obj_id, relationship_type, direction, obj_type)
+            for related_id in self.links.get(key, ()):
+                obj = self.get(related_id)
+                if obj is not None:
+                    yield obj
+
+
+def link_keys(
+    relationship_type: str, source: str, target: str
+) -> Tuple[Tuple[Tuple[str, str, str, str], str], ...]:
+    """
+    The typed & directed index keys of a relationship, at both ends.
+
+    Args:
+        - relationship_type: The relationship_type of the relationship
+        - source: STIX id of the source_ref
+        - target: STIX id of the target_ref
+
+    Returns:
+        Tuple of ((id, relationship_type, direction, other end's type),
+        other end's id) for the source and the target, see index_types()
+    """
+    return tuple(
+        ((source, relationship_type, 'out', obj_type), target)
+        for obj_type in index_types(stix_type(target))
+    ) + tuple(
+        ((target, relationship_type, 'in', obj_type), source)
+        for obj_type in index_types(stix_type(source))
+    )
+
+
+def phase_keys(obj: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    The kill chain phase index keys of an attack object.
+
+    Args:
+        - obj: The attack object
+
+    Returns:
+        List of (phase_name, STIX type), a tactic's is its shortname
+    """
+    obj_type = obj.get('type')
+
+    if obj_type == 'x-mitre-tactic':
+        phase_names = [obj.get('x_mitre_shortname')]
+    else:
+        phase_names = [
+            phase.get('phase_name')
+            for phase in obj.get('kill_chain_phases') or ()
+        ]
+
+    return [
+        (phase_name, obj_type)
+        for phase_name in dict.fromkeys(phase_names)
+        if phase_name
+    ]
+
+
+def data_source_names(data_sources: list[str] | None) -> list[str]:
+    """
+    Parse the data source names from a technique's x_mitre_data_sources.
+
+    Args:
+        - data_sources: Entries of "Data Source: Component", eg:
+            ['Process: OS API Execution', 'Process: Process Access']
+
+    Returns:
+        The data source names, once each in order, eg: ['Process']
+    """
+    if not isinstance(data_sources, (list, tuple)):
+        return []
+
+    return list(
+        dict.fromkeys(
+            entry.partition(':')[0].strip() for entry in data_sources
+        )
+    )
+
+
+def detection_chain(
+    id_lookup: Mapping[str, Dict[str, Any]], data_source_id: str
+) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Follow a data source to its components & the techniques they detect.
+
+    Args:
+        - id_lookup: The ObjectIndex (or ObjectStore) of the dataset
+        - data_source_id: STIX id of the data source
+
+    Returns:
+        Iterator of (component, [techniques & sub-techniques it detects])
+    """
+    for component in id_lookup.related(
+        data_source_id, DATA_SOURCE_REF, 'in', 'x-mitre-data-component'
+    ):
+        yield component, list(
+            id_lookup.related(
+                component['id'], 'detects', 'out', 'attack-pattern'
+            )
+        )
+
+
+def stix_type(stix_id: str) -> str:
+    """Return the STIX type of a STIX id, eg: 'attack-pattern'"""
+    return stix_id.partition('--')[0]
+
+
+def external_id_rank(
+    external_id: str, obj: Dict[str, Any]
+) -> Tuple[bool, bool]:
+    """
+    How well an attack object matches an ATT&CK id it carries, lowest first.
+
+    Objects of the STIX type the id's prefix stands for come first, then
+    those that are neither deprecated nor revoked.
+
+    Args:
+        - external_id: The ATT&CK id, eg: T1055
+        - obj: An attack object with that id
+
+    Returns:
+        Tuple of (wrong type, deprecated or revoked)
+    """
+    prefix = external_id.rstrip('0123456789.')
+
+    return (
+        obj.get('type') not in EXTERNAL_ID_TYPES.get(prefix, ()),
+        bool(obj.get('x_mitre_deprecated') or obj.get('revoked')),
+    )
+
+
+def index_types(obj_type: str) -> Tuple[str, ...]:
+    """
+    The types an object of a STIX type is indexed by.
+
+    Args:
+        - obj_type: The STIX type, eg: 'malware'
+
+    Returns:
+        Tuple of the STIX type, and SOFTWARE for malware & tools
+    """
+    if obj_type in SOFTWARE_TYPES:
+        return (obj_type, SOFTWARE)
+    return (obj_type,)
+
+
 # -----------------------------------------------------------------------------
 # Set relationships:
 # -----------------------------------------------------------------------------
@@ -212,7 +1232,7 @@ def match_tactics(
 
 def set_relationships(
     attack_objects: Dict[str, Any],
-) -> Tuple[Dict[str, List[str]], Dict[str, Dict]]:
+) -> Tuple[Dict[str, List[str]], ObjectIndex]:
     """
     Set the relationship mappings and ID lookup from the attack objects.
 
@@ -220,7 +1240,7 @@ def set_relationships(
         attack_objects: Dict containing 'objects' list of attack objects
 
     Returns:
-        Tuple of (relationships dict, id_lookup dict)
+        Tuple of (relationships dict, id_lookup ObjectIndex)
 
     Raises:
         enterpriseattack.Error: If input JSON structure is invalid
@@ -232,30 +1252,406 @@ def set_relationships(
         )
 
     relationships = {}
-    id_lookup = {}
+    id_lookup = ObjectIndex()
 
     for obj in attack_objects['objects']:
-        obj_id = obj.get('id')
-        obj_type = obj.get('type')
-
-        # Add to ID lookup if valid object
-        if obj_id and obj_type != 'relationship':
-            id_lookup[obj_id] = obj
-
-        # Handle relationship objects
-        if obj_type == 'relationship':
-            source = obj.get('source_ref')
-            target = obj.get('target_ref')
-            if source and target:
-                relationships.setdefault(source, []).append(target)
-                relationships.setdefault(target, []).append(source)
-
-        # Handle data components
-        elif obj_type == 'x-mitre-data-component':
-            component_id = obj_id
-            data_source = obj.get('x_mitre_data_source_ref')
-            if component_id and data_source:
-                relationships.setdefault(component_id, []).append(data_source)
-                relationships.setdefault(data_source, []).append(component_id)
+        index_object(obj, relationships, id_lookup)
 
     return relationships, id_lookup
+
+
+def as_object_index(
+    attack_objects: Mapping[str, Any], id_lookup: Mapping[str, Any]
+) -> Mapping[str, Any]:
+    """
+    Return an id_lookup the entities can query, indexing it if needed.
+
+    Entities built by hand may be given a plain dict of id's to objects,
+    which is indexed here from the dataset's objects (or its own objects,
+    if there are none) the same way an Attack indexes them.
+
+    Args:
+        attack_objects: Dict containing 'objects' list of attack objects
+        id_lookup: Key/values of id's to objects
+
+    Returns:
+        id_lookup if it is already indexed, otherwise a new ObjectIndex
+    """
+    if isinstance(id_lookup, LazyMapping) or hasattr(id_lookup, 'related'):
+        return id_lookup
+
+    objects = None
+    if isinstance(attack_objects, Mapping):
+        objects = attack_objects.get('objects')
+
+    relationships = {}
+    index = ObjectIndex()
+    for obj in objects or id_lookup.values():
+        index_object(obj, relationships, index)
+
+    return index
+
+
+def index_object(
+    obj: Dict[str, Any],
+    relationships: Dict[str, List[str]],
+    id_lookup: ObjectIndex,
+) -> bool:
+    """
+    Fold a single attack object into the relationship mappings & ID lookup.
+
+    Args:
+        obj: The attack object to index
+        relationships: The source/target relationship mappings to update
+        id_lookup: The ID lookup to update
+
+    Returns:
+        True if the object was a relationship, which is fully captured by
+        the relationship mappings
+    """
+    obj_id = obj.get('id')
+    obj_type = obj.get('type')
+
+    # Add to ID lookup if valid object
+    if obj_id and obj_type != 'relationship':
+        id_lookup.add(obj)
+
+    # Handle relationship objects
+    if obj_type == 'relationship':
+        source = obj.get('source_ref')
+        target = obj.get('target_ref')
+        if source and target:
+            relationships.setdefault(source, []).append(target)
+            relationships.setdefault(target, []).append(source)
+            id_lookup.link(obj.get('relationship_type'), source, target)
+        return True
+
+    # Handle data components
+    if obj_type == 'x-mitre-data-component':
+        component_id = obj_id
+        data_source = obj.get('x_mitre_data_source_ref')
+        if component_id and data_source:
+            relationships.setdefault(component_id, []).append(data_source)
+            relationships.setdefault(data_source, []).append(component_id)
+            id_lookup.link(DATA_SOURCE_REF, component_id, data_source)
+
+    return False
+
+
+def unindex_object(
+    obj: Dict[str, Any],
+    relationships: Dict[str, List[str]],
+    id_lookup: ObjectIndex,
+) -> None:
+    """
+    Remove what index_object() added for an attack object.
+
+    Args:
+        obj: The attack object, as it was indexed
+        relationships: The source/target relationship mappings to update
+        id_lookup: The ID lookup to update
+    """
+    obj_id = obj.get('id')
+    obj_type = obj.get('type')
+
+    if obj_type == 'relationship':
+        relationship_type = obj.get('relationship_type')
+        pair = (obj.get('source_ref'), obj.get('target_ref'))
+    elif obj_type == 'x-mitre-data-component':
+        relationship_type = DATA_SOURCE_REF
+        pair = (obj_id, obj.get('x_mitre_data_source_ref'))
+    else:
+        pair = (None, None)
+
+    if obj_id and obj_type != 'relationship':
+        id_lookup.discard(obj)
+
+    source, target = pair
+    if source and target:
+        id_lookup.unlink(relationship_type, source, target)
+        for key, value in ((source, target), (target, source)):
+            related = relationships.get(key)
+            if related and value in related:
+                related.remove(value)
+                if not related:
+                    del relationships[key]
+
+
+def diff_objects(
+    old_objects: Iterable[Dict[str, Any]],
+    new_objects: Iterable[Dict[str, Any]],
+) -> Tuple[List[Dict], List[Dict], List[Tuple[Dict, Dict]]]:
+    """
+    Compare two versions of the dataset objects by id & modified time.
+
+    Args:
+        old_objects: The objects of the current dataset
+        new_objects: The objects of the new dataset
+
+    Returns:
+        Tuple of (added objects, removed objects, (old, new) modified objects)
+    """
+    old_by_id = {obj.get('id'): obj for obj in old_objects}
+
+    added = []
+    modified = []
+    for obj in new_objects:
+        old = old_by_id.pop(obj.get('id'), None)
+        if old is None:
+            added.append(obj)
+        elif old.get('modified') != obj.get('modified'):
+            modified.append((old, obj))
+
+    return added, list(old_by_id.values()), modified
+
+
+# -----------------------------------------------------------------------------
+# Parse & index the dataset in a single streaming pass:
+# -----------------------------------------------------------------------------
+
+
+def stream_json(
+    local_enterprise_json: str,
+    keep_relationships: bool = False,
+    transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, List[str]], ObjectIndex]:
+    """
+    Parses the local dataset object by object, indexing as it goes.
+
+    Only one attack object is decoded at a time, and it is indexed straight
+    away, so the whole json tree never exists alongside the indexes.
+    Relationship objects are dropped once folded into the relationship
+    mappings, unless keep_relationships is set.
+
+    Args:
+        - local_enterprise_json: Name of the local dataset file
+        - keep_relationships: Keep relationship objects in attack_objects
+        - transform: Optional ingest transform applied to each object
+
+    Returns:
+        Tuple of (attack_objects dict, relationships dict, id_lookup
+        ObjectIndex)
+
+    Raises:
+        FileNotFoundError: If the local dataset was not found
+        enterpriseattack.Error: If the json is invalid
+    """
+    attack_objects = {}
+    relationships = {}
+    id_lookup = ObjectIndex()
+
+    logging.debug(f'Streaming local json: {local_enterprise_json}')
+
+    with open_dataset(local_enterprise_json, 'rb') as f:
+        reader = _JsonReader(f)
+
+        try:
+            reader.expect('{')
+
+            while reader.peek() != '}':
+                if reader.peek() == ',':
+                    reader.advance()
+                    continue
+
+                key = reader.value()
+                reader.expect(':')
+
+                if key != 'objects' or reader.peek() != '[':
+                    attack_objects[key] = reader.value()
+                    continue
+
+                reader.advance()
+                objects = attack_objects['objects'] = []
+
+                while reader.peek() != ']':
+                    if reader.peek() == ',':
+                        reader.advance()
+                        continue
+
+                    obj = reader.value()
+                    if transform:
+                        obj = transform(obj)
+
+                    is_relationship = index_object(
+                        obj, relationships, id_lookup
+                    )
+
+                    if keep_relationships or not is_relationship:
+                        objects.append(obj)
+
+                reader.advance()
+
+        except ValueError as e:
+            raise enterpriseattack.Error(
+                f'Unable to parse: {local_enterprise_json}, error: {e}'
+            )
+
+    # Check for bogus json:
+    if not attack_objects.get('objects'):
+        raise enterpriseattack.Error(
+            'Unable to find enterprise objects, json seems invalid.'
+        )
+
+    logging.debug('Successfully streamed local json')
+    return attack_objects, relationships, id_lookup
+
+
+# -----------------------------------------------------------------------------
+# _JsonReader class:
+# -----------------------------------------------------------------------------
+
+
+class _JsonReader:
+
+    # -------------------------------------------------------------------------
+
+    def __init__(self, f: IO[bytes]) -> None:
+        """
+        Decodes json values one at a time from a binary file, reading it in
+        chunks and only buffering the text of the value being decoded.
+
+        Args:
+            - f: Binary file object to read from
+        """
+        self._f = f
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk into the buffer, False if at end of file"""
+        if self._eof:
+            return False
+
+        chunk = self._f.read(CHUNK_SIZE)
+        self._eof = not chunk
+        pending = self._buffer[self._pos :]  # noqa: E203
+        self._buffer = pending + self._text.decode(chunk, final=self._eof)
+        self._pos = 0
+        return True
+
+    # -------------------------------------------------------------------------
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, without consuming it"""
+        while True:
+            while (
+                self._pos < len(self._buffer)
+                and self._buffer[self._pos] in ' \t\r\n'
+            ):
+                self._pos += 1
+
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._fill():
+                raise ValueError('Unexpected end of json')
+
+    def advance(self) -> None:
+        """Consume the next character"""
+        self.peek()
+        self._pos += 1
+
+    def expect(self, char: str) -> None:
+        """Consume the next character, which must be char"""
+        if self.peek() != char:
+            raise ValueError(f'Expected "{char}" at offset {self._pos}')
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode and consume the next json value"""
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+
+                # A number could continue into the next chunk:
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            self._fill()
+
+
+# -----------------------------------------------------------------------------
+# Log how long each loading phase takes:
+# -----------------------------------------------------------------------------
+
+
+@contextmanager
+def log_duration(
+    phase: str,
+    progress: Optional[Callable[[str, Optional[float]], Any]] = None,
+) -> Iterator[None]:
+    """
+    Logs the wall time spent in a loading phase.
+
+    Args:
+        - phase: Name of the phase to log
+        - progress: Called with (phase, None) as the phase starts, and
+            (phase, seconds taken) once it is done
+    """
+    if progress:
+        progress(phase, None)
+
+    start = time.perf_counter()
+    yield
+    duration = time.perf_counter() - start
+    logging.info(f'{phase} took {duration:.3f}s')
+
+    if progress:
+        progress(phase, duration)
+
+
+# -----------------------------------------------------------------------------
+# LazyMapping class:
+# -----------------------------------------------------------------------------
+
+
+class LazyMapping(Mapping):
+
+    # -------------------------------------------------------------------------
+
+    def __init__(self, build: Callable[[], Mapping]) -> None:
+        """
+        Stands in for a dict that is only built when it is first accessed.
+
+        Args:
+            - build: Callable returning the real mapping
+        """
+        self._build = build
+        self._mapping = None
+
+    def _resolve(self) -> Mapping:
+        if self._mapping is None:
+            self._mapping = self._build()
+        return self._mapping
+
+    # -------------------------------------------------------------------------
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._resolve()[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._resolve())
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._resolve()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._resolve().get(key, default)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._resolve(), name)
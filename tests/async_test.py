@@ -0,0 +1,60 @@
+# ----------------------------------------------------------------------------#
+
+import asyncio
+import enterpriseattack
+import logging
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_async_load_reports_progress(local_json):
+    progress = []
+
+    attack = asyncio.run(
+        enterpriseattack.AsyncAttack.load(
+            enterprise_json=local_json,
+            progress=lambda phase, duration: progress.append(
+                (phase, duration is None)
+            ),
+        )
+    )
+
+    assert 'Process Injection' in [t.name for t in attack.techniques]
+    assert progress == [
+        ('Loading dataset', True),
+        ('Loading dataset', False),
+        ('Indexing relationships', True),
+        ('Indexing relationships', False),
+    ]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_async_refresh_swaps_dataset(http_server, tmp_path):
+    localJson = str(tmp_path / 'enterprise-attack.json')
+
+    async def load_and_refresh():
+        attack = await enterpriseattack.AsyncAttack.load(
+            enterprise_json=localJson, url=http_server.url, update=True
+        )
+        before = [t.name for t in attack.techniques]
+
+        http_server.payload = http_server.payload.replace(
+            b'Process Injection', b'Process Injection v2'
+        )
+        refresh = asyncio.ensure_future(attack.refresh())
+
+        # The current dataset is served while refreshing:
+        assert [t.name for t in attack.techniques] == before
+
+        await refresh
+        return before, [t.name for t in attack.techniques]
+
+    before, after = asyncio.run(load_and_refresh())
+
+    assert 'Process Injection' in before
+    assert 'Process Injection v2' in after
@@ -0,0 +1,89 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+import pytest
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def _version_urls(http_server):
+    return f'{http_server.url.rsplit("/", 1)[0]}/v{{version}}/' \
+        'enterprise-attack.json'
+
+# ----------------------------------------------------------------------------#
+
+
+def test_load_versions_concurrently(http_server, tmp_path):
+    for version in ('14', '15'):
+        http_server.payloads[f'/v{version}/enterprise-attack.json'] = \
+            http_server.payload.replace(
+                b'Process Injection', f'Process Injection {version}'.encode()
+            )
+
+    attacks = enterpriseattack.load_versions(
+        ['v14', 'v15', 'latest'],
+        directory=str(tmp_path),
+        url=http_server.url,
+        url_template=_version_urls(http_server),
+    )
+
+    assert list(attacks) == ['v14', 'v15', 'latest']
+    assert attacks['v15'].mitre_version == 'v15'
+    assert 'Process Injection 14' in \
+        [t.name for t in attacks['v14'].techniques]
+    assert 'Process Injection 15' in \
+        [t.name for t in attacks['v15'].techniques]
+    assert 'Process Injection' in \
+        [t.name for t in attacks['latest'].techniques]
+    assert (tmp_path / 'enterprise-attack-v14.json').is_file()
+
+# ----------------------------------------------------------------------------#
+
+
+def test_load_versions_retries(http_server, tmp_path):
+    http_server.failures = 2
+
+    attacks = enterpriseattack.load_versions(
+        ['v15'],
+        directory=str(tmp_path),
+        url_template=_version_urls(http_server),
+        backoff_factor=0,
+    )
+
+    assert len(http_server.requests) == 3
+    assert 'Process Injection' in [t.name for t in attacks['v15'].techniques]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_load_versions_reports_failures(http_server, tmp_path):
+    http_server.payloads['/v1/enterprise-attack.json'] = None
+
+    with pytest.raises(enterpriseattack.Error, match='v1'):
+        enterpriseattack.load_versions(
+            ['v1', 'v15'],
+            directory=str(tmp_path),
+            url_template=_version_urls(http_server),
+            retries=0,
+        )
+
+# ----------------------------------------------------------------------------#
+
+
+def test_version_downloaded_from_given_url(http_server, tmp_path):
+    attack = enterpriseattack.Attack(
+        enterprise_json=str(tmp_path / 'enterprise-attack.json'),
+        url=http_server.url,
+        mitre_version='v14',
+    )
+
+    assert 'Process Injection' in [t.name for t in attack.techniques]
+    assert attack.delta_update() == \
+        {'added': [], 'removed': [], 'modified': []}
+    assert [r['path'] for r in http_server.requests] == \
+        ['/enterprise-attack.json'] * 2
@@ -0,0 +1,43 @@
+# ----------------------------------------------------------------------------#
+
+import bz2
+import enterpriseattack
+import gzip
+import logging
+import lzma
+import pytest
+import ujson
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('module, ext', [
+    (gzip, '.gz'), (lzma, '.xz'), (bz2, '.bz2'), (gzip, '')
+])
+def test_read_compressed(tmp_path, stix_bundle, module, ext):
+    localJson = tmp_path / f'enterprise-attack.json{ext}'
+    localJson.write_bytes(module.compress(ujson.dumps(stix_bundle).encode()))
+
+    attack = enterpriseattack.Attack(enterprise_json=str(localJson))
+
+    assert attack.attack_objects == stix_bundle
+
+# ----------------------------------------------------------------------------#
+
+
+def test_download_compressed(http_server, tmp_path, stix_bundle):
+    localJson = tmp_path / 'enterprise-attack.json.xz'
+
+    enterpriseattack.Attack(
+        enterprise_json=str(localJson), url=http_server.url, update=True
+    )
+
+    assert lzma.decompress(localJson.read_bytes()) == http_server.payload
+
+    attack = enterpriseattack.Attack(enterprise_json=str(localJson))
+
+    assert attack.attack_objects == stix_bundle
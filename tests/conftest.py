@@ -2,7 +2,10 @@
 
 import enterpriseattack
 import pytest
+import threading
+import ujson
 
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 # ----------------------------------------------------------------------------#
@@ -36,3 +39,272 @@ def attack_update_latest_nonSubscript_deprecated(scope='module'):
 def attack_local(scope='module'):
     localJson = f'{Path(__file__).parent}/data/enterprise-attack.json'
     return enterpriseattack.Attack(enterprise_json=localJson)
+
+# ----------------------------------------------------------------------------#
+# Small offline STIX bundle, shaped like enterprise-attack.json:
+# ----------------------------------------------------------------------------#
+
+
+def _obj(obj_type, num, external_id=None, **kwargs):
+    obj = {
+        'type': obj_type,
+        'id': f'{obj_type}--00000000-0000-0000-0000-{num:012d}',
+        'created': '2020-01-01T00:00:00.000Z',
+        'modified': '2020-01-01T00:00:00.000Z',
+        'created_by_ref': 'identity--c78cb6e5-0c4b-4611-8297-d1b8b55e40b5',
+        'object_marking_refs': [
+            'marking-definition--fa42a846-8d90-4e51-bc29-71d5b4802168'
+        ],
+        'x_mitre_domains': ['enterprise-attack'],
+    }
+    if external_id:
+        obj['external_references'] = [
+            {
+                'source_name': 'mitre-attack',
+                'external_id': external_id,
+                'url': f'https://attack.mitre.org/{external_id}',
+            },
+            {
+                'source_name': 'Example',
+                'description': f'Reference for {external_id}',
+            },
+        ]
+    obj.update(kwargs)
+    return obj
+
+
+def _rel(num, relationship_type, source, target):
+    return _obj(
+        'relationship',
+        num,
+        relationship_type=relationship_type,
+        source_ref=source['id'],
+        target_ref=target['id'],
+    )
+
+
+def build_bundle():
+    execution = _obj(
+        'x-mitre-tactic', 1, 'TA0002',
+        name='Execution', x_mitre_shortname='execution',
+        description='The adversary is trying to run malicious code.',
+    )
+    evasion = _obj(
+        'x-mitre-tactic', 2, 'TA0005',
+        name='Defense Evasion', x_mitre_shortname='defense-evasion',
+        description='The adversary is trying to avoid being detected.',
+    )
+    injection = _obj(
+        'attack-pattern', 1, 'T1055',
+        name='Process Injection',
+        description='Adversaries may inject code into processes.',
+        x_mitre_detection='Monitor process API calls.',
+        x_mitre_platforms=['Linux', 'Windows'],
+        x_mitre_is_subtechnique=False,
+        x_mitre_data_sources=[
+            'Process: OS API Execution', 'Process: Process Access'
+        ],
+        kill_chain_phases=[
+            {
+                'kill_chain_name': 'mitre-attack',
+                'phase_name': 'defense-evasion',
+            }
+        ],
+    )
+    interpreter = _obj(
+        'attack-pattern', 2, 'T1059',
+        name='Command and Scripting Interpreter',
+        description='Adversaries may abuse interpreters.',
+        x_mitre_platforms=['Linux', 'Windows'],
+        x_mitre_is_subtechnique=False,
+        x_mitre_data_sources=['Command: Command Execution'],
+        kill_chain_phases=[
+            {'kill_chain_name': 'mitre-attack', 'phase_name': 'execution'}
+        ],
+    )
+    dll_injection = _obj(
+        'attack-pattern', 3, 'T1055.001',
+        name='Dynamic-link Library Injection',
+        description='Adversaries may inject DLLs into processes.',
+        x_mitre_platforms=['Windows'],
+        x_mitre_is_subtechnique=True,
+        x_mitre_data_sources=['Process: OS API Execution'],
+        kill_chain_phases=[
+            {
+                'kill_chain_name': 'mitre-attack',
+                'phase_name': 'defense-evasion',
+            }
+        ],
+    )
+    old_technique = _obj(
+        'attack-pattern', 4, 'T1099',
+        name='Timestomp',
+        x_mitre_is_subtechnique=False,
+        x_mitre_deprecated=True,
+        kill_chain_phases=[
+            {
+                'kill_chain_name': 'mitre-attack',
+                'phase_name': 'defense-evasion',
+            }
+        ],
+    )
+    lazarus = _obj(
+        'intrusion-set', 1, 'G0032',
+        name='Lazarus Group', aliases=['Lazarus Group', 'HIDDEN COBRA'],
+        description='Lazarus Group is a threat group.',
+    )
+    old_group = _obj(
+        'intrusion-set', 2, 'G0099',
+        name='Old Group', x_mitre_deprecated=True,
+    )
+    cobalt_strike = _obj(
+        'malware', 1, 'S0154',
+        name='Cobalt Strike', labels=['malware'],
+        x_mitre_platforms=['Windows'],
+    )
+    mimikatz = _obj(
+        'tool', 1, 'S0002',
+        name='Mimikatz', labels=['tool'],
+        x_mitre_platforms=['Windows'],
+    )
+    code_signing = _obj(
+        'course-of-action', 1, 'M1045',
+        name='Code Signing',
+        description='Enforce binary and application integrity.',
+    )
+    process = _obj(
+        'x-mitre-data-source', 1, 'DS0009',
+        name='Process', x_mitre_platforms=['Linux', 'Windows'],
+        x_mitre_collection_layers=['Host'],
+    )
+    command = _obj(
+        'x-mitre-data-source', 2, 'DS0017',
+        name='Command', x_mitre_platforms=['Linux', 'Windows'],
+        x_mitre_collection_layers=['Host'],
+    )
+    api_execution = _obj(
+        'x-mitre-data-component', 1,
+        name='OS API Execution', x_mitre_data_source_ref=process['id'],
+    )
+    process_access = _obj(
+        'x-mitre-data-component', 2,
+        name='Process Access', x_mitre_data_source_ref=process['id'],
+    )
+    command_execution = _obj(
+        'x-mitre-data-component', 3,
+        name='Command Execution', x_mitre_data_source_ref=command['id'],
+    )
+    sharpshooter = _obj(
+        'campaign', 1, 'C0013',
+        name='Operation Sharpshooter',
+        first_seen='2017-09-01T04:00:00.000Z',
+        last_seen='2019-09-01T04:00:00.000Z',
+    )
+
+    objects = [
+        execution, evasion, injection, interpreter, dll_injection,
+        old_technique, lazarus, old_group, cobalt_strike, mimikatz,
+        code_signing, process, command, api_execution, process_access,
+        command_execution, sharpshooter,
+        _rel(1, 'subtechnique-of', dll_injection, injection),
+        _rel(2, 'uses', lazarus, injection),
+        _rel(3, 'uses', lazarus, dll_injection),
+        _rel(4, 'uses', lazarus, cobalt_strike),
+        _rel(5, 'uses', cobalt_strike, interpreter),
+        _rel(6, 'uses', mimikatz, injection),
+        _rel(7, 'uses', mimikatz, dll_injection),
+        _rel(8, 'mitigates', code_signing, injection),
+        _rel(9, 'detects', api_execution, injection),
+        _rel(10, 'detects', api_execution, dll_injection),
+        _rel(11, 'detects', process_access, injection),
+        _rel(12, 'detects', command_execution, interpreter),
+        _rel(13, 'uses', sharpshooter, cobalt_strike),
+        _rel(14, 'uses', sharpshooter, interpreter),
+        _rel(15, 'attributed-to', sharpshooter, lazarus),
+    ]
+
+    return {
+        'type': 'bundle',
+        'id': 'bundle--00000000-0000-0000-0000-000000000001',
+        'objects': objects,
+    }
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.fixture
+def stix_bundle():
+    return build_bundle()
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.fixture
+def local_json(tmp_path, stix_bundle):
+    localJson = tmp_path / 'enterprise-attack.json'
+    localJson.write_text(ujson.dumps(stix_bundle))
+    return str(localJson)
+
+# ----------------------------------------------------------------------------#
+# Local HTTP stand-in for the MITRE GitHub:
+# ----------------------------------------------------------------------------#
+
+
+class _DatasetHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.server.requests.append(
+            {'path': self.path, 'headers': dict(self.headers)}
+        )
+        body = self.server.payloads.get(self.path, self.server.payload)
+
+        if self.server.failures:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        etag = self.server.etag
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if etag:
+            self.send_header('ETag', etag)
+        if self.server.last_modified:
+            self.send_header('Last-Modified', self.server.last_modified)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server(stix_bundle):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _DatasetHandler)
+    server.payload = ujson.dumps(stix_bundle).encode()
+    server.payloads = {}
+    server.requests = []
+    server.failures = 0
+    server.etag = None
+    server.last_modified = None
+    server.url = f'http://127.0.0.1:{server.server_port}/' \
+        'enterprise-attack.json'
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
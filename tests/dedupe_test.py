@@ -0,0 +1,63 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+import pytest
+
+from enterpriseattack import utils
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_dedupe_shares_values(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json, dedupe=True)
+
+    objects = attack.attack_objects['objects']
+    domains = {id(obj['x_mitre_domains']) for obj in objects}
+    markings = {id(obj['object_marking_refs']) for obj in objects}
+
+    assert len(domains) == 1
+    assert len(markings) == 1
+    assert attack.bytes_saved > 0
+
+    injection = [
+        t for t in attack.techniques if t.name == 'Process Injection'
+    ][0]
+
+    assert injection.platforms == ('Linux', 'Windows')
+    assert {t.name for t in injection.tactics} == {'Defense Evasion'}
+    assert injection.id == 'T1055'
+
+    with pytest.raises(TypeError):
+        injection.kill_chain_phases[0]['phase_name'] = 'execution'
+
+# ----------------------------------------------------------------------------#
+
+
+def test_dedupe_snapshot_and_store(local_json):
+    eager = enterpriseattack.Attack(enterprise_json=local_json)
+
+    for options in [{'use_snapshot': True}, {'storage': 'mmap'}]:
+        for _ in range(2):
+            attack = enterpriseattack.Attack(
+                enterprise_json=local_json, dedupe=True, **options
+            )
+
+        assert [t.to_json()['name'] for t in attack.techniques] == \
+            [t.to_json()['name'] for t in eager.techniques]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_dedupe_keeps_value_types():
+    deduplicator = utils.Deduplicator()
+
+    first = deduplicator({'a': [1]})
+    second = deduplicator({'a': [True]})
+
+    assert second['a'][0] is True
+    assert first['a'][0] == 1
@@ -0,0 +1,153 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+import pytest
+import ujson
+
+from tests.conftest import _obj, _rel
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def _next_release(stix_bundle):
+    objects = {obj['id']: obj for obj in stix_bundle['objects']}
+    injection = objects['attack-pattern--00000000-0000-0000-0000-000000000001']
+    mimikatz = objects['tool--00000000-0000-0000-0000-000000000001']
+
+    injection['name'] = 'Process Injection v2'
+    injection['modified'] = '2021-01-01T00:00:00.000Z'
+
+    # Drop the old group & Mimikatz's use of Process Injection:
+    del objects['intrusion-set--00000000-0000-0000-0000-000000000002']
+    del objects['relationship--00000000-0000-0000-0000-000000000006']
+
+    # Add a technique Mimikatz uses:
+    dumping = _obj(
+        'attack-pattern', 5, 'T1003',
+        name='OS Credential Dumping', x_mitre_is_subtechnique=False,
+        kill_chain_phases=[
+            {
+                'kill_chain_name': 'mitre-attack',
+                'phase_name': 'credential-access',
+            }
+        ],
+    )
+    uses = _rel(16, 'uses', mimikatz, dumping)
+    objects[uses['id']] = uses
+
+    # New objects are not only appended:
+    stix_bundle['objects'] = [dumping] + list(objects.values())
+    return ujson.dumps(stix_bundle).encode()
+
+
+def _sorted_relationships(attack):
+    return {k: sorted(v) for k, v in attack.relationships.items()}
+
+# ----------------------------------------------------------------------------#
+
+
+def test_delta_update_patches_changed_objects(
+    http_server, tmp_path, stix_bundle
+):
+    localJson = str(tmp_path / 'enterprise-attack.json')
+    attack = enterpriseattack.Attack(
+        enterprise_json=localJson, url=http_server.url, update=True
+    )
+
+    http_server.payload = _next_release(stix_bundle)
+    changes = attack.delta_update()
+
+    assert changes == {
+        'added': [
+            'attack-pattern--00000000-0000-0000-0000-000000000005',
+            'relationship--00000000-0000-0000-0000-000000000016',
+        ],
+        'removed': [
+            'intrusion-set--00000000-0000-0000-0000-000000000002',
+            'relationship--00000000-0000-0000-0000-000000000006',
+        ],
+        'modified': [
+            'attack-pattern--00000000-0000-0000-0000-000000000001',
+        ],
+    }
+
+    # Everything is in the same order as a fresh load:
+    rebuilt = enterpriseattack.Attack(enterprise_json=localJson)
+
+    assert attack.attack_objects == rebuilt.attack_objects
+    assert attack.relationships == rebuilt.relationships
+    assert list(attack.id_lookup) == list(rebuilt.id_lookup)
+    for index in ('types', 'links', 'external_ids', 'phases', 'names'):
+        assert getattr(attack.id_lookup, index) == \
+            getattr(rebuilt.id_lookup, index)
+
+    assert [t.name for t in attack.techniques] == \
+        [t.name for t in rebuilt.techniques]
+    assert [t.name for t in attack['TA0005'].techniques] == \
+        [t.name for t in rebuilt['TA0005'].techniques]
+
+    mimikatz = next(s for s in attack.software if s.name == 'Mimikatz')
+    assert sorted(t.name for t in mimikatz.techniques) == \
+        ['OS Credential Dumping']
+
+# ----------------------------------------------------------------------------#
+
+
+def test_delta_update_not_modified(http_server, tmp_path):
+    localJson = str(tmp_path / 'enterprise-attack.json')
+    http_server.etag = '"v1"'
+    attack = enterpriseattack.Attack(
+        enterprise_json=localJson, url=http_server.url, update=True
+    )
+    relationships = _sorted_relationships(attack)
+
+    changes = attack.delta_update()
+
+    assert changes == {'added': [], 'removed': [], 'modified': []}
+    assert _sorted_relationships(attack) == relationships
+
+# ----------------------------------------------------------------------------#
+
+
+def test_delta_update_after_another_download(
+    http_server, tmp_path, stix_bundle
+):
+    localJson = str(tmp_path / 'enterprise-attack.json')
+    http_server.etag = '"v2"'
+    attack = enterpriseattack.Attack(
+        enterprise_json=localJson, url=http_server.url, update=True
+    )
+
+    # Another process downloads the next release, so the server now
+    # answers "not modified":
+    http_server.etag = '"v3"'
+    http_server.payload = _next_release(stix_bundle)
+    enterpriseattack.Attack(
+        enterprise_json=localJson, url=http_server.url, update=True
+    )
+
+    changes = attack.delta_update()
+
+    assert changes['added'] == [
+        'attack-pattern--00000000-0000-0000-0000-000000000005',
+        'relationship--00000000-0000-0000-0000-000000000016',
+    ]
+    assert http_server.requests[-1]['headers']['If-None-Match'] == '"v3"'
+    rebuilt = enterpriseattack.Attack(enterprise_json=localJson)
+    assert attack.relationships == rebuilt.relationships
+
+# ----------------------------------------------------------------------------#
+
+
+def test_delta_update_needs_writable_dataset(http_server, local_json):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, url=http_server.url, shared=True
+    )
+
+    with pytest.raises(enterpriseattack.Error):
+        attack.delta_update()
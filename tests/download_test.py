@@ -0,0 +1,150 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+import multiprocessing
+import pytest
+import threading
+
+from enterpriseattack import utils
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_download_saves_raw_bytes(http_server, tmp_path):
+    localJson = tmp_path / 'enterprise-attack.json'
+
+    attack = enterpriseattack.Attack(
+        enterprise_json=str(localJson), url=http_server.url, update=True
+    )
+
+    assert localJson.read_bytes() == http_server.payload
+    assert 'Process Injection' in [t.name for t in attack.techniques]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_download_invalid_json_keeps_local_file(
+    http_server, local_json, stix_bundle
+):
+    http_server.payload = b'{"objects": ['
+
+    with pytest.raises(enterpriseattack.Error):
+        enterpriseattack.Attack(
+            enterprise_json=local_json, url=http_server.url, update=True
+        )
+
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+
+    assert len(attack.attack_objects['objects']) == \
+        len(stix_bundle['objects'])
+
+# ----------------------------------------------------------------------------#
+
+
+def test_update_not_modified_reuses_local_file(http_server, tmp_path):
+    localJson = tmp_path / 'enterprise-attack.json'
+    http_server.etag = '"v1"'
+    http_server.last_modified = 'Wed, 01 Jan 2025 00:00:00 GMT'
+
+    enterpriseattack.Attack(
+        enterprise_json=str(localJson), url=http_server.url, update=True
+    )
+    mtime = localJson.stat().st_mtime_ns
+
+    attack = enterpriseattack.Attack(
+        enterprise_json=str(localJson), url=http_server.url, update=True
+    )
+
+    headers = http_server.requests[-1]['headers']
+    assert headers.get('If-None-Match') == '"v1"'
+    assert headers.get('If-Modified-Since') == http_server.last_modified
+    assert localJson.stat().st_mtime_ns == mtime
+    assert 'Process Injection' in [t.name for t in attack.techniques]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_update_modified_downloads_again(http_server, tmp_path):
+    localJson = tmp_path / 'enterprise-attack.json'
+    http_server.etag = '"v1"'
+
+    enterpriseattack.Attack(
+        enterprise_json=str(localJson), url=http_server.url, update=True
+    )
+
+    http_server.etag = '"v2"'
+    http_server.payload = http_server.payload.replace(
+        b'Process Injection', b'Process Injection v2'
+    )
+
+    attack = enterpriseattack.Attack(
+        enterprise_json=str(localJson), url=http_server.url, update=True
+    )
+
+    assert localJson.read_bytes() == http_server.payload
+    assert 'Process Injection v2' in [t.name for t in attack.techniques]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_download_waits_for_and_reuses_other_download(
+    http_server, tmp_path
+):
+    localJson = str(tmp_path / 'enterprise-attack.json')
+    results = []
+
+    with utils.file_lock(localJson):
+        waiter = threading.Thread(
+            target=lambda: results.append(
+                utils.download(http_server.url, localJson)
+            )
+        )
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive()
+
+        # Another process downloads it meanwhile:
+        with open(localJson, 'wb') as f:
+            f.write(http_server.payload)
+        utils.write_metadata(localJson, {'url': http_server.url})
+
+    waiter.join()
+
+    assert results == [None]
+    assert http_server.requests == []
+
+# ----------------------------------------------------------------------------#
+
+
+def _count_techniques(enterprise_json, url):
+    attack = enterpriseattack.Attack(
+        enterprise_json=enterprise_json, url=url, update=True
+    )
+    return len(attack.techniques)
+
+
+@pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(),
+    reason='Needs fork to share the local HTTP server'
+)
+def test_concurrent_processes_download_once(http_server, tmp_path):
+    localJson = str(tmp_path / 'enterprise-attack.json')
+    http_server.etag = '"v1"'
+
+    with multiprocessing.get_context('fork').Pool(8) as pool:
+        counts = pool.starmap(
+            _count_techniques, [(localJson, http_server.url)] * 8
+        )
+
+    downloads = [
+        r for r in http_server.requests
+        if 'If-None-Match' not in r['headers']
+    ]
+    assert len(downloads) == 1
+    assert len(set(counts)) == 1
+    assert not list(tmp_path.glob('*.download*'))
@@ -0,0 +1,137 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import gc
+import logging
+import weakref
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_same_instance_per_stix_id(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+
+    injection = attack['T1055']
+    lazarus = attack['G0032']
+
+    assert attack['T1055'] is injection
+    assert [t for t in attack.techniques if t.name == 'Process Injection'] \
+        == [injection]
+    assert lazarus.techniques == [injection]
+    assert injection.groups == [lazarus]
+    assert attack['T1055.001'].techniques == [injection]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_unused_entities_are_dropped(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+
+    injection = weakref.ref(attack['T1055'])
+    gc.collect()
+
+    assert injection() is None
+    assert len(attack.identity_map) == 0
+
+# ----------------------------------------------------------------------------#
+
+
+def test_entity_cache_size_keeps_recent(local_json):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, entity_cache_size=2
+    )
+
+    injection = weakref.ref(attack['T1055'])
+    attack['G0032']
+    gc.collect()
+
+    assert injection() is attack['T1055']
+
+    attack['S0002']
+    attack['M1045']
+    gc.collect()
+
+    assert injection() is None
+
+# ----------------------------------------------------------------------------#
+
+
+def test_new_dataset_new_entities(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+    injection = attack['T1055']
+
+    attack.id_lookup = enterpriseattack.Attack(
+        enterprise_json=local_json
+    ).id_lookup
+
+    assert attack['T1055'] is not injection
+
+# ----------------------------------------------------------------------------#
+
+
+def test_relations_are_memoised(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+    injection = attack['T1055']
+    queries = []
+    related = attack.id_lookup.related
+
+    def counting_related(*args):
+        queries.append(args)
+        return related(*args)
+
+    attack.id_lookup.related = counting_related
+
+    groups = injection.groups
+    assert injection.groups == groups
+    assert injection.groups[0] is groups[0]
+    assert injection.to_json()['groups'] == ['Lazarus Group']
+    assert len([q for q in queries if q[3] == 'intrusion-set']) == 1
+
+    attack.clear_caches()
+
+    assert injection.groups[0] is not groups[0]
+    assert injection.groups == [attack['G0032']]
+    assert len([q for q in queries if q[3] == 'intrusion-set']) == 2
+
+# ----------------------------------------------------------------------------#
+
+
+def test_memoised_relations_do_not_pin_entities(local_json):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, entity_cache_size=1
+    )
+    lazarus = attack['G0032']
+
+    techniques = weakref.ref(lazarus.techniques[0])
+    lazarus.software
+    lazarus.tactics
+    gc.collect()
+
+    # Only the live entity & the most recently used one are left:
+    assert len(attack.identity_map) <= 2
+    assert techniques() is None
+    assert [t.name for t in lazarus.techniques] == ['Process Injection']
+
+# ----------------------------------------------------------------------------#
+
+
+def test_delta_update_clears_caches(http_server, tmp_path):
+    attack = enterpriseattack.Attack(
+        enterprise_json=str(tmp_path / 'enterprise-attack.json'),
+        url=http_server.url,
+        update=True,
+    )
+    lazarus = attack['G0032']
+    assert [t.name for t in lazarus.techniques] == ['Process Injection']
+
+    http_server.payload = http_server.payload.replace(
+        b'Process Injection', b'Process Injection v2'
+    ).replace(b'2020-01-01T00:00:00.000Z', b'2021-01-01T00:00:00.000Z')
+    attack.delta_update()
+
+    assert [t.name for t in lazarus.techniques] == ['Process Injection v2']
+    assert attack['G0032'] is not lazarus
@@ -0,0 +1,310 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import gc
+import logging
+import pytest
+import ujson
+
+from tests.conftest import _obj, _rel
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_of_type(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+
+    assert [
+        obj['name'] for obj in attack.id_lookup.of_type('x-mitre-tactic')
+    ] == ['Execution', 'Defense Evasion']
+    assert [
+        obj['name'] for obj in attack.id_lookup.of_type('malware', 'tool')
+    ] == ['Cobalt Strike', 'Mimikatz']
+    assert list(attack.id_lookup.of_type('x-unknown')) == []
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('storage', ['memory', 'mmap'])
+def test_collections_skip_the_objects_scan(local_json, storage):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, storage=storage
+    )
+    expected = {
+        'tactics': [t.name for t in attack.tactics],
+        'techniques': [t.name for t in attack.techniques],
+        'groups': [g.name for g in attack.groups],
+        'software': [s.name for s in attack.software],
+        'data_sources': [d.name for d in attack.data_sources],
+    }
+
+    # The collections never walk the objects list:
+    attack.attack_objects = {'objects': ()}
+
+    assert expected == {
+        'tactics': [t.name for t in attack.tactics],
+        'techniques': [t.name for t in attack.techniques],
+        'groups': [g.name for g in attack.groups],
+        'software': [s.name for s in attack.software],
+        'data_sources': [d.name for d in attack.data_sources],
+    }
+    assert 'Process Injection' in expected['techniques']
+
+# ----------------------------------------------------------------------------#
+
+
+def test_type_index_follows_changes(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+    mimikatz = attack.id_lookup['tool--00000000-0000-0000-0000-000000000001']
+
+    enterpriseattack.utils.unindex_object(
+        mimikatz, attack.relationships, attack.id_lookup
+    )
+    assert [s.name for s in attack.tools] == []
+
+    attack.id_lookup.add(mimikatz)
+    assert [s.name for s in attack.tools] == ['Mimikatz']
+
+    attack.preload()
+    try:
+        with pytest.raises(TypeError):
+            attack.id_lookup.add(mimikatz)
+    finally:
+        gc.unfreeze()
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('storage', ['memory', 'mmap'])
+def test_related(local_json, storage):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, storage=storage
+    )
+    injection = 'attack-pattern--00000000-0000-0000-0000-000000000001'
+    lazarus = 'intrusion-set--00000000-0000-0000-0000-000000000001'
+
+    def related(*args):
+        return [obj['name'] for obj in attack.id_lookup.related(*args)]
+
+    assert related(
+        injection, 'detects', 'in', 'x-mitre-data-component'
+    ) == ['OS API Execution', 'Process Access']
+    assert related(injection, 'uses', 'in', 'malware', 'tool') == [
+        'Mimikatz'
+    ]
+    assert related(injection, 'subtechnique-of', 'in', 'attack-pattern') == [
+        'Dynamic-link Library Injection'
+    ]
+    assert related(lazarus, 'uses', 'out', 'malware') == ['Cobalt Strike']
+    assert related(lazarus, 'attributed-to', 'in', 'campaign') == [
+        'Operation Sharpshooter'
+    ]
+    assert related(lazarus, 'mitigates', 'in', 'course-of-action') == []
+
+# ----------------------------------------------------------------------------#
+
+
+def test_links_follow_changes(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+    mitigates = {
+        'type': 'relationship',
+        'id': 'relationship--00000000-0000-0000-0000-000000000008',
+        'relationship_type': 'mitigates',
+        'source_ref': 'course-of-action--00000000-0000-0000-0000-000000000001',
+        'target_ref': 'attack-pattern--00000000-0000-0000-0000-000000000001',
+    }
+    injection = [
+        t for t in attack.techniques if t.name == 'Process Injection'
+    ][0]
+
+    assert [m.name for m in injection.mitigations] == ['Code Signing']
+
+    enterpriseattack.utils.unindex_object(
+        mitigates, attack.relationships, attack.id_lookup
+    )
+    attack.clear_caches()
+    assert injection.mitigations == []
+    assert not any(key[1] == 'mitigates' for key in attack.id_lookup.links)
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('storage', ['memory', 'mmap'])
+def test_lookup_by_attack_id(local_json, storage):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, storage=storage
+    )
+
+    assert attack['T1055'].name == 'Process Injection'
+    assert type(attack['T1055.001']).__name__ == 'SubTechnique'
+    assert attack['TA0005'].name == 'Defense Evasion'
+    assert attack['G0032'].name == 'Lazarus Group'
+    assert attack['S0002'].name == 'Mimikatz'
+    assert attack['M1045'].name == 'Code Signing'
+    assert attack['DS0009'].name == 'Process'
+    assert attack['C0013'].name == 'Operation Sharpshooter'
+    assert attack[
+        'x-mitre-data-component--00000000-0000-0000-0000-000000000001'
+    ].name == 'OS API Execution'
+
+    with pytest.raises(KeyError):
+        attack['T9999']
+    assert attack.get('T9999') is None
+    assert attack.get_by_id('G0032').name == 'Lazarus Group'
+
+    # Deprecated objects are only found with include_deprecated:
+    assert attack.get('T1099') is None
+    assert enterpriseattack.Attack(
+        enterprise_json=local_json, storage=storage, include_deprecated=True
+    )['T1099'].name == 'Timestomp'
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('storage', ['memory', 'mmap'])
+def test_kill_chain_phases(local_json, storage):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, storage=storage, include_deprecated=True
+    )
+    evasion = attack['TA0005']
+
+    assert [
+        obj['name'] for obj in attack.id_lookup.in_phase(
+            'defense-evasion', 'x-mitre-tactic', 'attack-pattern'
+        )
+    ] == [
+        'Defense Evasion', 'Process Injection',
+        'Dynamic-link Library Injection', 'Timestomp',
+    ]
+    assert [t.name for t in evasion.techniques] == [
+        'Process Injection', 'Timestomp'
+    ]
+    assert [t.name for t in evasion.sub_techniques] == [
+        'Dynamic-link Library Injection'
+    ]
+    assert [t.name for t in attack['T1059'].tactics] == ['Execution']
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('storage', ['memory', 'mmap'])
+def test_datasources_by_name(local_json, storage):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, storage=storage
+    )
+
+    assert [d.name for d in attack['T1055'].datasources] == ['Process']
+    assert [d.name for d in attack['T1055.001'].datasources] == ['Process']
+    assert [d.name for d in attack['T1059'].datasources] == ['Command']
+    assert enterpriseattack.utils.data_source_names(
+        ['Process: OS API Execution', 'Process Access: X', 'Process: Y']
+    ) == ['Process', 'Process Access']
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('storage', ['memory', 'mmap'])
+def test_detection_chain(local_json, storage):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, storage=storage
+    )
+    process = attack['DS0009']
+
+    assert [t.name for t in process.techniques] == ['Process Injection']
+    assert [t.name for t in process.sub_techniques] == [
+        'Dynamic-link Library Injection'
+    ]
+    assert attack.detection_map() == {
+        'Process': {
+            'OS API Execution': ['T1055', 'T1055.001'],
+            'Process Access': ['T1055'],
+        },
+        'Command': {'Command Execution': ['T1059']},
+    }
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('storage', ['memory', 'mmap'])
+def test_software_in_dataset_order(tmp_path, stix_bundle, storage):
+    objects = {obj['id']: obj for obj in stix_bundle['objects']}
+    mimikatz = objects.pop('tool--00000000-0000-0000-0000-000000000001')
+    lazarus = objects['intrusion-set--00000000-0000-0000-0000-000000000001']
+
+    # A tool before the malware, used by Lazarus before Cobalt Strike:
+    stix_bundle['objects'] = [
+        mimikatz, _rel(16, 'uses', lazarus, mimikatz)
+    ] + list(objects.values())
+
+    localJson = tmp_path / 'enterprise-attack.json'
+    localJson.write_text(ujson.dumps(stix_bundle))
+    attack = enterpriseattack.Attack(
+        enterprise_json=str(localJson), storage=storage
+    )
+
+    assert [s.name for s in attack.software] == ['Mimikatz', 'Cobalt Strike']
+    assert [s.name for s in attack['G0032'].software] == [
+        'Mimikatz', 'Cobalt Strike'
+    ]
+    assert [s.name for s in attack.malware] == ['Cobalt Strike']
+    assert [s.name for s in attack.tools] == ['Mimikatz']
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('storage', ['memory', 'mmap'])
+@pytest.mark.parametrize('include_deprecated', [False, True])
+def test_shared_attack_id(tmp_path, stix_bundle, storage, include_deprecated):
+    # Legacy mitigations carry the id of their technique:
+    legacy = _obj(
+        'course-of-action', 9, 'T1055',
+        name='Process Injection Mitigation', x_mitre_deprecated=True,
+    )
+    stix_bundle['objects'].insert(0, legacy)
+
+    localJson = tmp_path / 'enterprise-attack.json'
+    localJson.write_text(ujson.dumps(stix_bundle))
+    attack = enterpriseattack.Attack(
+        enterprise_json=str(localJson),
+        storage=storage,
+        include_deprecated=include_deprecated,
+    )
+
+    assert attack['T1055'].name == 'Process Injection'
+    assert attack.get('T1055').name == 'Process Injection'
+
+    if storage == 'memory':
+        injection = attack.id_lookup.external_id('T1055')
+
+        # Removing the technique uncovers the mitigation, until re-added:
+        attack.id_lookup.discard(injection)
+        assert attack.id_lookup.external_id('T1055')['id'] == legacy['id']
+        attack.id_lookup.add(injection)
+        assert attack.id_lookup.external_id('T1055') is injection
+
+# ----------------------------------------------------------------------------#
+
+
+def test_entity_from_plain_dicts(stix_bundle):
+    from enterpriseattack.tactic import Tactic
+    from enterpriseattack.technique import Technique
+
+    id_lookup = {obj['id']: obj for obj in stix_bundle['objects']}
+    injection = id_lookup[
+        'attack-pattern--00000000-0000-0000-0000-000000000001'
+    ]
+    evasion = id_lookup['x-mitre-tactic--00000000-0000-0000-0000-000000000002']
+
+    technique = Technique(stix_bundle, {}, id_lookup, **injection)
+    assert [g.name for g in technique.groups] == ['Lazarus Group']
+    assert [t.name for t in technique.tactics] == ['Defense Evasion']
+    assert [d.name for d in technique.datasources] == ['Process']
+
+    tactic = Tactic(stix_bundle, {}, id_lookup, **evasion)
+    assert [t.name for t in tactic.techniques] == [
+        'Process Injection', 'Timestomp'
+    ]
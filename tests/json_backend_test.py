@@ -0,0 +1,46 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+import pytest
+
+from enterpriseattack import utils
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.mark.parametrize('json_backend', utils.JSON_BACKENDS)
+def test_json_backends_load_the_same(local_json, json_backend):
+    pytest.importorskip(json_backend)
+
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, json_backend=json_backend
+    )
+    reference = enterpriseattack.Attack(
+        enterprise_json=local_json, json_backend='json'
+    )
+
+    assert attack.attack_objects == reference.attack_objects
+    assert [t.name for t in attack.techniques] == \
+        [t.name for t in reference.techniques]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_json_backend_auto_picks_fastest():
+    orjson = pytest.importorskip('orjson')
+
+    assert utils.json_loads() is orjson.loads
+
+# ----------------------------------------------------------------------------#
+
+
+def test_json_backend_unknown(local_json):
+    with pytest.raises(enterpriseattack.Error):
+        enterpriseattack.Attack(
+            enterprise_json=local_json, json_backend='simplejson'
+        )
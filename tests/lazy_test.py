@@ -0,0 +1,49 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_lazy_defers_loading(tmp_path):
+    attack = enterpriseattack.Attack(
+        enterprise_json=str(tmp_path / 'missing.json'),
+        url='http://127.0.0.1:9/enterprise-attack.json',
+        lazy=True,
+    )
+
+    assert attack._loaded is False
+    assert attack._indexed is False
+
+# ----------------------------------------------------------------------------#
+
+
+def test_lazy_phases(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json, lazy=True)
+
+    assert len(attack.attack_objects['objects'])
+    assert attack._loaded is True
+    assert attack._indexed is False
+
+    # Collections are served from the type index:
+    tactics = attack.tactics
+
+    assert {t.name for t in tactics} == {'Execution', 'Defense Evasion'}
+    assert attack._indexed is True
+
+    evasion = [t for t in tactics if t.name == 'Defense Evasion'][0]
+    injection = [
+        t for t in evasion.techniques if t.name == 'Process Injection'
+    ][0]
+
+    assert [g.name for g in injection.groups] == ['Lazarus Group']
+
+    eager = enterpriseattack.Attack(enterprise_json=local_json)
+
+    assert attack.relationships == eager.relationships
+    assert attack.id_lookup == eager.id_lookup
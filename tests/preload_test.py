@@ -0,0 +1,52 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import gc
+import logging
+import pytest
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+@pytest.fixture
+def preloaded(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json, lazy=True)
+    yield attack.preload()
+    gc.unfreeze()
+
+# ----------------------------------------------------------------------------#
+
+
+def test_preload_indexes_and_freezes(preloaded):
+    assert gc.get_freeze_count() > 0
+
+    with pytest.raises(TypeError):
+        preloaded.id_lookup['x'] = {}
+
+    with pytest.raises(TypeError):
+        preloaded.attack_objects['objects'][0]['name'] = 'x'
+
+    assert isinstance(preloaded.attack_objects['objects'], tuple)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_preload_keeps_objects_shared(preloaded):
+    for obj in preloaded.attack_objects['objects']:
+        if obj['type'] != 'relationship':
+            assert preloaded.id_lookup[obj['id']] is obj
+
+# ----------------------------------------------------------------------------#
+
+
+def test_preload_matches_unfrozen(local_json, preloaded):
+    attack = enterpriseattack.Attack(enterprise_json=local_json)
+
+    assert [t.name for t in preloaded.techniques] == \
+        [t.name for t in attack.techniques]
+    assert [g.name for g in preloaded.techniques[0].groups] == \
+        [g.name for g in attack.techniques[0].groups]
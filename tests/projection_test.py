@@ -0,0 +1,73 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_exclude_fields(local_json):
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json,
+        exclude_fields=[
+            'description', 'x_mitre_detection', 'external_references'
+        ],
+    )
+
+    injection = [
+        t for t in attack.techniques if t.name == 'Process Injection'
+    ][0]
+
+    assert injection.description is None
+    assert injection.detection is None
+    assert injection.id == 'T1055'
+    assert injection.url == 'https://attack.mitre.org/T1055'
+    assert injection.references == []
+    assert injection.platforms == ['Linux', 'Windows']
+    assert [g.name for g in injection.groups] == ['Lazarus Group']
+    assert injection.to_json()['description'] is None
+
+# ----------------------------------------------------------------------------#
+
+
+def test_fields_whitelist(local_json):
+    for streaming in [True, False]:
+        attack = enterpriseattack.Attack(
+            enterprise_json=local_json,
+            fields=['x_mitre_platforms'],
+            streaming=streaming,
+        )
+
+        for obj in attack.id_lookup.values():
+            assert 'description' not in obj
+            assert 'created' not in obj
+
+        injection = [
+            t for t in attack.techniques if t.name == 'Process Injection'
+        ][0]
+
+        assert injection.platforms == ['Linux', 'Windows']
+        assert {t.name for t in injection.tactics} == {'Defense Evasion'}
+        assert {d.name for d in injection.datasources} == {'Process'}
+
+# ----------------------------------------------------------------------------#
+
+
+def test_projection_keys_snapshot(local_json):
+    enterpriseattack.Attack(
+        enterprise_json=local_json,
+        exclude_fields=['description'],
+        use_snapshot=True,
+    )
+
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, use_snapshot=True
+    )
+
+    assert attack.id_lookup[
+        'attack-pattern--00000000-0000-0000-0000-000000000001'
+    ].get('description')
@@ -0,0 +1,102 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import gc
+import logging
+import pytest
+
+from enterpriseattack import registry
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_shared_attacks_load_once(local_json, monkeypatch):
+    loads = []
+    read_json = enterpriseattack.utils.read_json
+
+    def counting_read_json(*args, **kwargs):
+        loads.append(args)
+        return read_json(*args, **kwargs)
+
+    monkeypatch.setattr(
+        enterpriseattack.utils, 'read_json', counting_read_json
+    )
+
+    first = enterpriseattack.Attack(enterprise_json=local_json, shared=True)
+    second = enterpriseattack.Attack(enterprise_json=local_json, shared=True)
+
+    assert len(loads) == 1
+    assert second.attack_objects is first.attack_objects
+    assert second.id_lookup is first.id_lookup
+    assert [t.name for t in second.techniques] == \
+        [t.name for t in first.techniques]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_shared_dataset_is_read_only(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json, shared=True)
+
+    with pytest.raises(TypeError):
+        attack.id_lookup['x'] = {}
+
+# ----------------------------------------------------------------------------#
+
+
+def test_shared_dataset_keyed_by_options(local_json):
+    full = enterpriseattack.Attack(enterprise_json=local_json, shared=True)
+    projected = enterpriseattack.Attack(
+        enterprise_json=local_json, shared=True, fields=['name']
+    )
+
+    assert projected.attack_objects is not full.attack_objects
+
+# ----------------------------------------------------------------------------#
+
+
+def test_shared_dataset_evicted_when_unused(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json, shared=True)
+    key = attack._dataset_key
+
+    assert registry.get_dataset(key) is not None
+
+    del attack
+    gc.collect()
+
+    assert registry.get_dataset(key) is None
+
+# ----------------------------------------------------------------------------#
+
+
+def test_shared_dataset_is_deeply_read_only(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json, shared=True)
+    injection = attack.id_lookup.external_id('T1055')
+
+    with pytest.raises(TypeError):
+        injection['name'] = 'Changed'
+    with pytest.raises(AttributeError):
+        injection['kill_chain_phases'].append({})
+    with pytest.raises(AttributeError):
+        attack.attack_objects['objects'].append({})
+
+    # Objects are still shared between the dataset and its indexes:
+    assert any(obj is injection for obj in attack.attack_objects['objects'])
+    assert attack.id_lookup[injection['id']] is injection
+
+# ----------------------------------------------------------------------------#
+
+
+def test_lock_dropped_with_dataset(local_json):
+    attack = enterpriseattack.Attack(enterprise_json=local_json, shared=True)
+    key = attack._dataset_key
+
+    assert key in registry._locks
+
+    del attack
+    gc.collect()
+
+    assert key not in registry._locks
@@ -0,0 +1,52 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+import os
+
+from enterpriseattack import snapshot
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_snapshot_written_and_reused(local_json):
+    cold = enterpriseattack.Attack(
+        enterprise_json=local_json, use_snapshot=True
+    )
+
+    assert os.path.isfile(snapshot.snapshot_path(local_json))
+
+    warm = enterpriseattack.Attack(
+        enterprise_json=local_json, use_snapshot=True
+    )
+
+    assert warm.attack_objects == cold.attack_objects
+    assert warm.relationships == cold.relationships
+    assert warm.id_lookup.keys() == cold.id_lookup.keys()
+    assert [t.name for t in warm.techniques] == \
+        [t.name for t in cold.techniques]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_snapshot_invalidated_on_source_change(local_json):
+    enterpriseattack.Attack(enterprise_json=local_json, use_snapshot=True)
+
+    with open(local_json, 'a') as f:
+        f.write(' ')
+
+    assert snapshot.read_snapshot(local_json) is None
+
+# ----------------------------------------------------------------------------#
+
+
+def test_snapshot_invalidated_on_version_change(local_json, monkeypatch):
+    enterpriseattack.Attack(enterprise_json=local_json, use_snapshot=True)
+
+    monkeypatch.setattr(enterpriseattack, '__version__', '0.0.0')
+
+    assert snapshot.read_snapshot(local_json) is None
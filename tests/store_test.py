@@ -0,0 +1,60 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import logging
+import os
+
+from enterpriseattack import store
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_mmap_storage_matches_memory(local_json):
+    memory = enterpriseattack.Attack(enterprise_json=local_json)
+    mapped = enterpriseattack.Attack(
+        enterprise_json=local_json, storage='mmap'
+    )
+
+    assert os.path.isfile(store.store_path(local_json))
+    assert isinstance(mapped.id_lookup, store.ObjectStore)
+    assert list(mapped.attack_objects['objects']) == \
+        memory.attack_objects['objects']
+    assert dict(mapped.id_lookup) == memory.id_lookup
+    assert mapped.relationships == memory.relationships
+
+    for meth in ['techniques', 'groups', 'software', 'data_sources']:
+        assert [obj.to_json() for obj in getattr(mapped, meth)] == \
+            [obj.to_json() for obj in getattr(memory, meth)]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_store_external_id_lookup(local_json):
+    mapped = enterpriseattack.Attack(
+        enterprise_json=local_json, storage='mmap'
+    )
+
+    assert mapped.id_lookup.external_id('T1055')['name'] == \
+        'Process Injection'
+    assert mapped.id_lookup.external_id('T0000') is None
+
+# ----------------------------------------------------------------------------#
+
+
+def test_store_rebuilt_when_stale(local_json):
+    enterpriseattack.Attack(enterprise_json=local_json, storage='mmap')
+
+    with open(local_json, 'a') as f:
+        f.write(' ')
+
+    assert store.open_store(local_json) is None
+
+    mapped = enterpriseattack.Attack(
+        enterprise_json=local_json, storage='mmap'
+    )
+
+    assert isinstance(mapped.id_lookup, store.ObjectStore)
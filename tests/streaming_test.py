@@ -0,0 +1,79 @@
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import gzip
+import json
+import logging
+import pytest
+
+from enterpriseattack import utils
+
+# ----------------------------------------------------------------------------#
+
+logging.basicConfig(level=logging.DEBUG)
+
+# ----------------------------------------------------------------------------#
+
+
+def test_streaming_matches_full_parse(local_json):
+    eager = enterpriseattack.Attack(enterprise_json=local_json)
+    streamed = enterpriseattack.Attack(
+        enterprise_json=local_json, streaming=True
+    )
+
+    assert streamed.relationships == eager.relationships
+    assert streamed.id_lookup == eager.id_lookup
+    assert not [
+        obj for obj in streamed.attack_objects['objects']
+        if obj['type'] == 'relationship'
+    ]
+
+    for meth in ['techniques', 'groups', 'software', 'campaigns']:
+        assert [obj.to_json() for obj in getattr(streamed, meth)] == \
+            [obj.to_json() for obj in getattr(eager, meth)]
+
+# ----------------------------------------------------------------------------#
+
+
+def test_stream_json_across_chunks(tmp_path, stix_bundle, monkeypatch):
+    monkeypatch.setattr(utils, 'CHUNK_SIZE', 7)
+    stix_bundle['spec_version'] = '2.1'
+    stix_bundle['x_count'] = 12345
+
+    localJson = tmp_path / 'enterprise-attack.json.gz'
+    localJson.write_bytes(
+        gzip.compress(json.dumps(stix_bundle, indent=4).encode())
+    )
+
+    attack_objects, _, _ = utils.stream_json(
+        str(localJson), keep_relationships=True
+    )
+
+    assert attack_objects == stix_bundle
+
+# ----------------------------------------------------------------------------#
+
+
+def test_stream_json_invalid(tmp_path):
+    localJson = tmp_path / 'enterprise-attack.json'
+    localJson.write_text('{"objects": [{"id": "x"},')
+
+    with pytest.raises(enterpriseattack.Error):
+        utils.stream_json(str(localJson))
+
+# ----------------------------------------------------------------------------#
+
+
+def test_streaming_snapshot_not_reused(local_json):
+    enterpriseattack.Attack(
+        enterprise_json=local_json, streaming=True, use_snapshot=True
+    ).id_lookup
+    attack = enterpriseattack.Attack(
+        enterprise_json=local_json, use_snapshot=True
+    )
+
+    # A streamed snapshot has no relationship objects to diff against:
+    assert [
+        obj for obj in attack.attack_objects['objects']
+        if obj['type'] == 'relationship'
+    ]
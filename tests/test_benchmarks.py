@@ -0,0 +1,470 @@
+# ----------------------------------------------------------------------------#
+# Benchmarks against the full enterprise-attack.json, run with:
+#   ENTERPRISEATTACK_BENCHMARKS=1 python tests/test_benchmarks.py
+# They are skipped unless $ENTERPRISEATTACK_BENCHMARKS is set, except the
+# import time check which always runs. The dataset is read from
+# $ENTERPRISEATTACK_JSON, tests/data or downloaded to a temporary directory,
+# benchmarks are skipped when it is unavailable.
+# ----------------------------------------------------------------------------#
+
+import enterpriseattack
+import gc
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from pathlib import Path
+
+# ----------------------------------------------------------------------------#
+
+LOCAL_JSON = f'{Path(__file__).parent}/data/enterprise-attack.json'
+WORKERS = (1, 8, 32)
+
+# Downloaded once for all benchmarks, removed on exit:
+DOWNLOAD_DIR = None
+
+# Only imported when used:
+DEFERRED_IMPORTS = (
+    'requests', 'asyncio', 'enterpriseattack.campaign',
+    'enterpriseattack.component', 'enterpriseattack.data_source',
+    'enterpriseattack.group', 'enterpriseattack.mitigation',
+    'enterpriseattack.software', 'enterpriseattack.sub_technique',
+    'enterpriseattack.tactic', 'enterpriseattack.technique',
+)
+
+# ----------------------------------------------------------------------------#
+
+
+def load_attack(**kwargs):
+    """Return an Attack of the full dataset, skipping if unavailable"""
+    global DOWNLOAD_DIR
+
+    if not os.environ.get('ENTERPRISEATTACK_BENCHMARKS'):
+        raise unittest.SkipTest('Set ENTERPRISEATTACK_BENCHMARKS=1 to run')
+
+    enterprise_json = os.environ.get('ENTERPRISEATTACK_JSON')
+    if not enterprise_json and os.path.isfile(LOCAL_JSON):
+        enterprise_json = LOCAL_JSON
+
+    if not enterprise_json:
+        DOWNLOAD_DIR = DOWNLOAD_DIR or tempfile.TemporaryDirectory()
+        enterprise_json = f'{DOWNLOAD_DIR.name}/enterprise-attack.json'
+
+    try:
+        return enterpriseattack.Attack(
+            enterprise_json=enterprise_json, **kwargs
+        )
+    except enterpriseattack.Error as e:
+        raise unittest.SkipTest(f'Dataset unavailable: {e}')
+
+
+def report(title, rows):
+    print(f'\n{title}')
+    for label, value in rows:
+        print(f'  {label:<40} {value}')
+
+# ----------------------------------------------------------------------------#
+# Parsing the dataset with each json backend:
+# ----------------------------------------------------------------------------#
+
+
+def test_json_backends():
+    with enterpriseattack.utils.open_dataset(
+        load_attack().enterprise_json
+    ) as f:
+        body = f.read()
+
+    rows = []
+    for json_backend in enterpriseattack.utils.JSON_BACKENDS:
+        try:
+            importlib.import_module(json_backend)
+        except ImportError:
+            rows.append((json_backend, 'not installed'))
+            continue
+
+        loads = enterpriseattack.utils.json_loads(json_backend)
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            loads(body)
+            timings.append(time.perf_counter() - start)
+
+        rows.append((json_backend, f'{min(timings) * 1000:.1f} ms'))
+
+    report(f'Parsing {len(body) / 2 ** 20:.1f} MiB of json:', rows)
+
+# ----------------------------------------------------------------------------#
+# Objects touched by a collection property:
+# ----------------------------------------------------------------------------#
+
+
+class CountingIndex(enterpriseattack.utils.ObjectIndex):
+    """An ObjectIndex counting the objects read from it"""
+
+    def __init__(self, id_lookup):
+        super().__init__(id_lookup)
+        self.types = id_lookup.types
+        self.touched = 0
+
+    def __getitem__(self, key):
+        self.touched += 1
+        return super().__getitem__(key)
+
+
+def test_tactics_touch():
+    attack = load_attack(include_deprecated=True)
+    objects = len(attack.attack_objects['objects'])
+    tactics = len(list(attack.id_lookup.of_type('x-mitre-tactic')))
+
+    # Any scan of the objects list would find nothing:
+    attack.attack_objects = {'objects': ()}
+    attack.id_lookup = CountingIndex(attack.id_lookup)
+
+    start = time.perf_counter()
+    assert len(attack.tactics) == tactics
+    elapsed = time.perf_counter() - start
+
+    assert attack.id_lookup.touched == tactics
+
+    report('attack.tactics:', [
+        ('objects in the dataset', objects),
+        ('objects touched', attack.id_lookup.touched),
+        ('time', f'{elapsed * 1000:.2f} ms'),
+    ])
+
+# ----------------------------------------------------------------------------#
+# Resolving ATT&CK ids:
+# ----------------------------------------------------------------------------#
+
+
+def test_attack_id_lookup():
+    attack = load_attack()
+    attack_ids = [t.id for t in attack.techniques]
+
+    start = time.perf_counter()
+    for attack_id in attack_ids:
+        assert attack[attack_id].id == attack_id
+    indexed = (time.perf_counter() - start) / len(attack_ids)
+
+    start = time.perf_counter()
+    for attack_id in attack_ids[:10]:
+        [t for t in attack.techniques if t.id == attack_id]
+    scanned = (time.perf_counter() - start) / 10
+
+    report('Resolving a technique id:', [
+        ("attack['T1055']", f'{indexed * 1e6:.1f} µs'),
+        ('scanning attack.techniques', f'{scanned * 1e6:.1f} µs'),
+    ])
+
+# ----------------------------------------------------------------------------#
+# Rendering the matrix, tactic by tactic:
+# ----------------------------------------------------------------------------#
+
+
+def render_matrix(attack):
+    """Each tactic's techniques, and every technique's tactics"""
+    return {
+        tactic.name: [
+            (technique.name, [t.name for t in technique.tactics])
+            for technique in tactic.techniques
+        ]
+        for tactic in attack.tactics
+    }
+
+
+def scan_matrix(attack):
+    """render_matrix() by scanning every object, as before the phase index"""
+    objects = attack.attack_objects['objects']
+    match = enterpriseattack.utils.match_tactics
+
+    matrix = {}
+    for tactic in attack.tactics:
+        matrix[tactic.name] = [
+            (obj['name'], [
+                t['name'] for t in objects
+                if t.get('type') == 'x-mitre-tactic'
+                and match(t.get('x_mitre_shortname'),
+                          obj.get('kill_chain_phases'))
+            ])
+            for obj in objects
+            if obj.get('type') == 'attack-pattern'
+            and not obj.get('x_mitre_is_subtechnique')
+            and match(tactic.short_name, obj.get('kill_chain_phases'))
+        ]
+
+    return matrix
+
+
+def test_matrix_rendering():
+    attack = load_attack()
+
+    def normalise(matrix):
+        return {
+            tactic: sorted(
+                (name, sorted(tactics)) for name, tactics in techniques
+            )
+            for tactic, techniques in matrix.items()
+        }
+
+    expected = normalise(render_matrix(attack))
+
+    rows = []
+    for label, render in (
+        ('phase index', render_matrix), ('scanning objects', scan_matrix)
+    ):
+        start = time.perf_counter()
+        matrix = render(attack)
+        rows.append((label, f'{(time.perf_counter() - start) * 1000:.1f} ms'))
+
+        assert normalise(matrix) == expected
+
+    report('Rendering the matrix:', rows)
+
+# ----------------------------------------------------------------------------#
+# Data source coverage of every technique:
+# ----------------------------------------------------------------------------#
+
+
+def test_data_source_coverage():
+    attack = load_attack()
+    techniques = attack.techniques
+    objects = attack.attack_objects['objects']
+    techniques[0].datasources
+
+    start = time.perf_counter()
+    coverage = {t.id: {d.name for d in t.datasources} for t in techniques}
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = {
+        t.id: {
+            d['name'] for d in objects
+            if d.get('type') == 'x-mitre-data-source'
+            and any(d['name'] in entry for entry in t.x_mitre_data_sources)
+        }
+        for t in techniques if t.x_mitre_data_sources
+    }
+    scanning = time.perf_counter() - start
+
+    # Substring matches are a superset of the exact ones:
+    assert all(coverage[t] <= names for t, names in scanned.items())
+
+    report('Data source coverage of every technique:', [
+        ('name index', f'{indexed * 1000:.1f} ms'),
+        ('substring scan of every object', f'{scanning * 1000:.1f} ms'),
+    ])
+
+# ----------------------------------------------------------------------------#
+# Detection coverage of every data source:
+# ----------------------------------------------------------------------------#
+
+
+def test_detection_map():
+    attack = load_attack()
+
+    start = time.perf_counter()
+    detection_map = attack.detection_map()
+    bulk = time.perf_counter() - start
+
+    start = time.perf_counter()
+    by_entity = {
+        data_source.name: {
+            component.name: [t.id for t in component.techniques]
+            for component in data_source.components
+        }
+        for data_source in attack.data_sources
+    }
+    entities = time.perf_counter() - start
+
+    assert set(detection_map) == set(by_entity)
+
+    report('Detection coverage of every data source:', [
+        ('attack.detection_map()', f'{bulk * 1000:.1f} ms'),
+        ('data source entities', f'{entities * 1000:.1f} ms'),
+    ])
+
+# ----------------------------------------------------------------------------#
+# Entities created walking software -> techniques -> sub-techniques:
+# ----------------------------------------------------------------------------#
+
+
+def test_entity_identity():
+    attack = load_attack()
+
+    start = time.perf_counter()
+    walked = [
+        sub_technique
+        for software in attack.software
+        for technique in software.techniques
+        for sub_technique in technique.sub_techniques
+    ]
+    elapsed = time.perf_counter() - start
+
+    report('Walking software -> techniques -> sub-techniques:', [
+        ('sub-techniques returned', len(walked)),
+        ('distinct instances', len({id(entity) for entity in walked})),
+        ('entities in the identity map', len(attack.identity_map)),
+        ('time', f'{elapsed * 1000:.1f} ms'),
+    ])
+
+# ----------------------------------------------------------------------------#
+# Repeated report traversals, with memoised relations:
+# ----------------------------------------------------------------------------#
+
+
+def test_memoised_relations():
+    attack = load_attack()
+    techniques = attack.techniques
+
+    rows = []
+    for label in ('first to_json() of every technique', 'second', 'third'):
+        start = time.perf_counter()
+        reports = [technique.to_json() for technique in techniques]
+        elapsed = time.perf_counter() - start
+        rows.append((label, f'{elapsed * 1000:.1f} ms'))
+
+    attack.clear_caches()
+    start = time.perf_counter()
+    assert [technique.to_json() for technique in techniques] == reports
+    rows.append((
+        'after clear_caches()',
+        f'{(time.perf_counter() - start) * 1000:.1f} ms',
+    ))
+
+    report('Technique reports:', rows)
+
+# ----------------------------------------------------------------------------#
+# Import time of the package:
+# ----------------------------------------------------------------------------#
+
+
+def import_times(module):
+    """Cumulative import time in µs of every module imported by module"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and 'cumulative' not in line:
+            _, cumulative, name = line.split('|')
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def test_import_time():
+    times = import_times('enterpriseattack')
+
+    eager = [
+        name for name in times
+        if name.startswith(DEFERRED_IMPORTS)
+    ]
+    assert not eager, f'Imported by `import enterpriseattack`: {eager}'
+
+    report('Import time:', [
+        ('import enterpriseattack',
+         f'{times["enterpriseattack"] / 1000:.1f} ms'),
+    ])
+
+# ----------------------------------------------------------------------------#
+# Per-worker unique memory of pre-fork workers:
+# ----------------------------------------------------------------------------#
+
+
+def uss(pid='self'):
+    """Unique set size of a process in bytes, from /proc"""
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        return sum(
+            int(line.split()[1]) * 1024
+            for line in f
+            if line.startswith(('Private_Clean:', 'Private_Dirty:'))
+        )
+
+
+def work(attack):
+    """What a worker does with the dataset between requests"""
+    for technique in attack.techniques:
+        technique.groups
+    attack.groups
+    attack.software
+    attack.mitigations
+    gc.collect()
+
+
+def fork_workers(attack, workers):
+    """Fork workers that all work at once, returning each one's USS"""
+    results_r, results_w = os.pipe()
+    release_r, release_w = os.pipe()
+    pids = []
+
+    for _ in range(workers):
+        pid = os.fork()
+        if not pid:
+            os.close(results_r)
+            os.close(release_w)
+            try:
+                work(attack)
+                os.write(results_w, f'{uss()}\n'.encode())
+                os.close(results_w)
+                os.read(release_r, 1)
+            finally:
+                os._exit(0)
+        pids.append(pid)
+
+    os.close(results_w)
+    os.close(release_r)
+
+    with os.fdopen(results_r) as f:
+        results = [int(line) for line in f]
+
+    os.close(release_w)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    return results
+
+
+def test_fork_worker_uss():
+    if not os.path.isfile('/proc/self/smaps_rollup'):
+        raise unittest.SkipTest('Measuring USS needs fork & /proc')
+
+    rows = []
+    for preload in (False, True):
+        attack = load_attack()
+        if preload:
+            attack.preload()
+
+        try:
+            for workers in WORKERS:
+                results = fork_workers(attack, workers)
+                assert len(results) == workers
+
+                mode = 'preload()' if preload else 'no preload'
+                rows.append((
+                    f'{mode}, {workers} workers',
+                    f'{statistics.mean(results) / 2 ** 20:.1f} MiB '
+                    'USS/worker',
+                ))
+        finally:
+            gc.unfreeze()
+
+    report('Pre-fork worker unique memory (USS):', rows)
+
+# ----------------------------------------------------------------------------#
+
+
+if __name__ == '__main__':
+    for name, benchmark in list(globals().items()):
+        if not name.startswith('test_'):
+            continue
+        try:
+            benchmark()
+        except unittest.SkipTest as e:
+            print(f'{name}: skipped, {e}', file=sys.stderr)